@@ -108,6 +108,10 @@ class WhisperTaskRequest(BaseModel):
         None,
         description="幻听静音阈值 / Hallucination silence threshold"
     )
+    beam_size: Optional[int] = Form(
+        None,
+        description="束搜索宽度，留空则使用服务端默认值 / Beam size, leave empty to use the server default"
+    )
 
     class Config:
         schema_extra = {
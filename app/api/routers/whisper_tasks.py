@@ -111,10 +111,13 @@ async def task_create(
     - `append_punctuations` (str): 后置标点符号集合，默认为 "\"'.。,，!！?？:：”)]}、"。
     - `clip_timestamps` (str): 裁剪时间戳，避免超出范围问题，默认为 "0"，可以是单个值或使用逗号分隔的多个值。
     - `hallucination_silence_threshold` (Optional[float]): 幻听静音阈值，默认为 None。
+    - `beam_size` (Optional[int]): 束搜索宽度，默认为 None，使用服务端默认值（faster_whisper 为 1，即贪心解码）。
 
     ### 返回:
 
     - 返回一个包含任务信息的响应，包括任务ID、状态、优先级等信息。
+    - 启用结果缓存时，若已有相同文件和参数的已完成任务，新任务会直接以已完成状态返回并复用其结果。
+    - 启用 `DEDUPLICATE_IN_FLIGHT_TASKS` 时，若相同文件、参数和回调地址的任务仍在排队或处理中，将直接返回该原任务（包括其任务ID、文件名、平台和优先级），不会创建新任务。
 
     ### 错误代码说明:
 
@@ -164,10 +167,13 @@ async def task_create(
     - `append_punctuations` (str): Append punctuation characters, default is "\"'.。,，!！?？:：”)]}、".
     - `clip_timestamps` (str): Clip timestamps to avoid out-of-range issues, default is "0", can be a single value or multiple values separated by commas.
     - `hallucination_silence_threshold` (Optional[float]): Hallucination silence threshold, default is None.
+    - `beam_size` (Optional[int]): Beam size, default is None, which uses the server default (1 for faster_whisper, i.e. greedy decoding).
 
     ### Returns:
 
     - Returns a response containing task information, including task ID, status, priority, etc.
+    - With the result cache enabled, if a completed task with the same file and parameters exists, the new task is returned as completed and reuses its result.
+    - With `DEDUPLICATE_IN_FLIGHT_TASKS` enabled, if a task with the same file, parameters and callback URL is still queued or processing, that original task is returned (including its task ID, file name, platform and priority) and no new task is created.
 
     ### Error Code Description:
 
@@ -227,6 +233,9 @@ async def task_create(
             "clip_timestamps": [float(clip) for clip in task_data.clip_timestamps.split(",")] if "," in task_data.clip_timestamps else task_data.clip_timestamps,
             "hallucination_silence_threshold": task_data.hallucination_silence_threshold
         }
+        # 仅在请求指定时传递束搜索宽度，否则由引擎使用服务端默认值 | Only pass the beam size when requested, otherwise the engine uses the server default
+        if task_data.beam_size:
+            decode_options["beam_size"] = task_data.beam_size
         task_info = await request.app.state.whisper_service.create_whisper_task(
             file_upload=file_upload if file_upload else None,
             file_name=file_upload.filename if file_upload else None,
@@ -671,6 +680,115 @@ async def task_result(
         )
 
 
+# 获取任务的转录片段 | Get task segments
+@router.get("/tasks/segments",
+            summary="获取任务的转录片段 / Get task segments",
+            response_model=ResponseModel,
+            response_description="任务已生成的转录片段 / Transcription segments produced by the task so far"
+            )
+async def task_segments(
+        request: Request,
+        task_id: int = Query(description="任务ID / Task ID")
+):
+    """
+    # [中文]
+
+    ### 用途说明:
+    - 获取指定任务已生成的转录片段，任务处理中时可用于获取部分结果。
+    - 任务已完成时返回完整结果中的片段。
+
+    ### 参数说明:
+    - `task_id` (int): 任务ID。
+
+    ### 返回:
+    - 返回一个包含任务ID、任务状态和转录片段列表的响应。
+
+    ### 错误代码说明:
+    - `404`: 任务未找到，可能是任务ID不存在。
+    - `500`: 发生未知错误。
+    - `503`: 数据库错误。
+
+    # [English]
+
+    ### Purpose:
+    - Get the transcription segments a task has produced so far, can be used to get partial results while the task is processing.
+    - Returns the segments of the full result once the task is completed.
+
+    ### Parameters:
+    - `task_id` (int): Task ID.
+
+    ### Returns:
+    - Returns a response containing the task ID, task status and the list of transcription segments.
+
+    ### Error Code Description:
+    - `404`: Task not found, possibly because the task ID does not exist.
+    - `500`: An unknown error occurred.
+    - `503`: Database error.
+    """
+    try:
+        # 通过任务ID查询任务 | Query task by task ID
+        task = await request.app.state.db_manager.get_task(task_id)
+        if not task:
+            # 任务未找到 - 返回404 | Task not found - return 404
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=ErrorResponseModel(
+                    code=status.HTTP_404_NOT_FOUND,
+                    message=TaskStatusHttpMessage.not_found.value,
+                    router=str(request.url),
+                    params=dict(request.query_params),
+                ).model_dump()
+            )
+
+        # 已完成的任务直接返回完整结果中的片段，其余任务返回转录过程中已保存的片段
+        # Completed tasks return the segments of the full result, other tasks return the segments saved during transcription
+        if task.status == TaskStatus.completed and task.result:
+            segments = task.result.get("segments", [])
+        else:
+            segments = await request.app.state.db_manager.get_task_segments(task_id)
+
+        return ResponseModel(
+            code=status.HTTP_200_OK,
+            router=str(request.url),
+            params=dict(request.query_params),
+            data={
+                "task_id": task.id,
+                "status": task.status,
+                "segments": segments
+            }
+        )
+
+    # 数据库错误 - 返回503 | Database error - return 503
+    except SQLAlchemyError as db_error:
+        logger.error(f"Database error: {str(db_error)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponseModel(
+                code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message=TaskStatusHttpMessage.service_unavailable.value,
+                router=str(request.url),
+                params=dict(request.query_params),
+            ).model_dump()
+        )
+
+    except HTTPException as http_error:
+        raise http_error
+
+    # 未知错误 - 返回500 | Unknown error - return 500
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponseModel(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message=f"An unexpected error occurred while retrieving the task segments: {str(e)}",
+                router=str(request.url),
+                params=dict(request.query_params),
+            ).model_dump()
+        )
+
+
 @router.post("/callback/test",
              summary="测试回调接口 / Test callback interface",
              response_model=ResponseModel,
@@ -34,21 +34,44 @@ import datetime
 import json
 import traceback
 from typing import Optional, List, Dict, Union
-from sqlalchemy import select, and_, func, case, inspect
+from sqlalchemy import select, update, delete, and_, or_, not_, func, case, inspect, bindparam, Integer, Float, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncEngine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 from sqlalchemy.sql import func
 from contextlib import asynccontextmanager
-from app.database.models.TaskModels import TaskBase, Task, QueryTasksOptionalFilter, TaskStatus, TaskPriority
+from app.database.models.TaskModels import TaskBase, Task, TaskSegment, QueryTasksOptionalFilter, TaskStatus, TaskPriority
 from app.database.models.WorkFlowModels import WorkFlowBase, Workflow, WorkflowTask, WorkflowNotification
 from app.database.models.CrawlerModels import CrawlerTask
 from app.database.models.ChatGPTModels import ChatGPTTask
 from app.utils.logging_utils import configure_logging
+from app.utils.result_utils import load_result_file, delete_result_file
 
 # 配置日志记录器 | Configure logger
 logger = configure_logging(name=__name__)
 
+# 任务优先级排序表达式，模块加载时构建一次 | Task priority ordering expression, built once at import time
+_PRIORITY_ORDER = case(
+    (Task.priority == TaskPriority.high, 1),
+    (Task.priority == TaskPriority.normal, 2),
+    (Task.priority == TaskPriority.low, 3),
+)
+
+# 获取排队任务的查询语句，数量通过绑定参数传入 | Statement for fetching queued tasks, the limit is passed as a bound parameter
+_QUEUED_TASKS_STMT = (
+    select(Task)
+    .where(Task.status == TaskStatus.queued)
+    .order_by(_PRIORITY_ORDER, Task.id)
+    .limit(bindparam("limit", type_=Integer))
+)
+
+# 认领排队任务的查询语句，跳过已被其他处理器锁定的行（SQLite 会忽略行锁） | Statement for claiming queued tasks, skipping rows locked by other processors (row locks are ignored on SQLite)
+_CLAIM_TASKS_STMT = _QUEUED_TASKS_STMT.with_for_update(skip_locked=True)
+
+# 仅认领短音频任务的查询语句，时长上限通过绑定参数传入 | Statement for claiming short audio tasks only, the duration cap is passed as a bound parameter
+_CLAIM_SHORT_TASKS_STMT = _CLAIM_TASKS_STMT.where(Task.file_duration <= bindparam("max_duration", type_=Float))
+
 
 class DatabaseManager:
     """
@@ -62,7 +85,10 @@ class DatabaseManager:
                  database_type: str,
                  database_url: str,
                  loop: Optional[asyncio.AbstractEventLoop] = None,
-                 reconnect_interval: int = 5
+                 reconnect_interval: int = 5,
+                 pool_size: int = 5,
+                 max_overflow: int = 10,
+                 pool_recycle: int = 3600
                  ) -> None:
         """
         初始化数据库管理器并根据数据库类型动态绑定相应的数据库引擎和会话。
@@ -73,6 +99,9 @@ class DatabaseManager:
         :param database_url: 数据库 URL | Database URL
         :param loop: 异步事件循环（可选）| Event loop (optional)
         :param reconnect_interval: 重连间隔（秒）| Reconnect interval (seconds)
+        :param pool_size: 连接池常驻连接数（仅 MySQL）| Number of persistent connections in the pool (MySQL only)
+        :param max_overflow: 连接池允许的额外连接数（仅 MySQL）| Extra connections allowed beyond pool_size (MySQL only)
+        :param pool_recycle: 连接回收时间（秒），避免使用被服务器关闭的连接（仅 MySQL）| Connection recycle time in seconds, avoids connections closed by the server (MySQL only)
         """
         self.database_type: str = database_type.lower()
         self.database_url: str = database_url
@@ -82,6 +111,9 @@ class DatabaseManager:
         self.reconnect_interval: int = reconnect_interval
         self._is_connected: bool = False
         self._max_retries: int = 5
+        self.pool_size: int = pool_size
+        self.max_overflow: int = max_overflow
+        self.pool_recycle: int = pool_recycle
 
     async def initialize(self) -> None:
         """
@@ -106,8 +138,9 @@ class DatabaseManager:
                         self.database_url,
                         echo=False,
                         pool_pre_ping=True,
-                        pool_size=5,
-                        max_overflow=10,
+                        pool_size=self.pool_size,
+                        max_overflow=self.max_overflow,
+                        pool_recycle=self.pool_recycle,
                         pool_timeout=30,
                         future=True
                     )
@@ -132,7 +165,7 @@ class DatabaseManager:
                     existing_tables = await conn.run_sync(sync_inspect)
 
                     # 检查是否存在表，如果不存在则创建 | Check if tables exist, if not create
-                    if 'tasks' not in existing_tables:
+                    if 'tasks' not in existing_tables or 'task_segments' not in existing_tables:
                         await conn.run_sync(TaskBase.metadata.create_all)
                     if 'workflow_workflows' not in existing_tables:
                         await conn.run_sync(WorkFlowBase.metadata.create_all)
@@ -141,6 +174,9 @@ class DatabaseManager:
                     if 'chatgpt_tasks' not in existing_tables:
                         await conn.run_sync(ChatGPTTask.metadata.create_all)
 
+                    # 为已存在的任务表补充新增的列和索引 | Add newly introduced columns and indexes to existing task tables
+                    await conn.run_sync(self._add_missing_columns)
+
                 self._is_connected = True
                 logger.info(f"{self.database_type.upper()} database connected and tables initialized successfully.")
             except OperationalError as e:
@@ -156,6 +192,34 @@ class DatabaseManager:
                 logger.error(traceback.format_exc())
                 raise
 
+    @staticmethod
+    def _add_missing_columns(connection) -> None:
+        """
+        为已存在的任务相关表补充模型中新增的列和索引，旧版本创建的数据库无需手动迁移即可使用。
+
+        Add columns and indexes introduced in the models to existing task tables,
+        so that databases created by older versions keep working without a manual migration.
+
+        :param connection: 同步数据库连接 | Synchronous database connection
+        :return: None
+        """
+        inspector = inspect(connection)
+        existing_tables = inspector.get_table_names()
+        for table in TaskBase.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=connection.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    logger.info(f"Added missing column `{column.name}` to table `{table.name}`.")
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+                    logger.info(f"Added missing index `{index.name}` to table `{table.name}`.")
+
     @asynccontextmanager
     async def get_session(self) -> AsyncSession:
         """
@@ -215,12 +279,50 @@ class DatabaseManager:
         async with self.get_session() as session:
             try:
                 task = await session.get(Task, task_id)
+                if task:
+                    await self._load_task_results([task])
                 return task if task else None
             except SQLAlchemyError as e:
                 logger.error(f"Error fetching task by ID {task_id}: {e}")
                 logger.error(traceback.format_exc())
                 return None
 
+    @staticmethod
+    async def _load_task_results(tasks: List[Task]) -> None:
+        """
+        为结果保存在文件中的任务读取结果并填充 result 属性，不会将其标记为待写回数据库。
+
+        Load the results of tasks whose results are stored in files and populate their result attribute,
+        without marking it as pending to be written back to the database.
+
+        :param tasks: 任务列表 | List of tasks
+        :return: None
+        """
+        tasks = [task for task in tasks if task.result is None and task.result_path]
+        if not tasks:
+            return
+        results = await asyncio.gather(*(asyncio.to_thread(load_result_file, task.result_path) for task in tasks))
+        for task, result in zip(tasks, results):
+            set_committed_value(task, "result", result)
+
+    @staticmethod
+    async def _delete_unreferenced_result_files(session: AsyncSession, result_paths: List[Optional[str]]) -> None:
+        """
+        删除已不被任何任务引用的结果文件，命中结果缓存的任务会共享同一个结果文件。
+
+        Delete result files no longer referenced by any task, tasks reusing a cached result share the same result file.
+
+        :param session: 数据库会话 | Database session
+        :param result_paths: 已删除任务的结果文件路径列表 | Result file paths of the deleted tasks
+        :return: None
+        """
+        result_paths = {path for path in result_paths if path}
+        if not result_paths:
+            return
+        referenced = await session.execute(select(Task.result_path).where(Task.result_path.in_(result_paths)))
+        for path in result_paths - set(referenced.scalars().all()):
+            await asyncio.to_thread(delete_result_file, path)
+
     async def get_queued_tasks(self, max_concurrent_tasks: int) -> List[Task]:
         """
         异步获取队列中的任务
@@ -231,18 +333,7 @@ class DatabaseManager:
         """
         async with self.get_session() as session:
             try:
-                result = await session.execute(
-                    select(Task)
-                    .where(Task.status == TaskStatus.queued)
-                    .order_by(
-                        case(
-                            (Task.priority == TaskPriority.high, 1),
-                            (Task.priority == TaskPriority.normal, 2),
-                            (Task.priority == TaskPriority.low, 3),
-                        )
-                    )
-                    .limit(max_concurrent_tasks)
-                )
+                result = await session.execute(_QUEUED_TASKS_STMT, {"limit": max_concurrent_tasks})
                 return result.scalars().all()
             except OperationalError:
                 self._is_connected = False
@@ -253,6 +344,108 @@ class DatabaseManager:
                 logger.error(traceback.format_exc())
                 raise
 
+    async def claim_queued_tasks(self,
+                                 max_concurrent_tasks: int,
+                                 max_duration: Optional[float] = None,
+                                 duration_bin: Union[int, None, bool] = False
+                                 ) -> List[Task]:
+        """
+        在同一个事务中按优先级获取排队任务并将其标记为处理中，避免多个处理器重复处理同一任务。
+
+        Fetches queued tasks by priority and marks them as processing within a single transaction,
+        so that the same task cannot be picked up by multiple processors.
+
+        :param max_concurrent_tasks: 最多认领的任务数量 | Maximum number of tasks to claim
+        :param max_duration: 仅认领时长不超过该值（秒）的任务，为 None 时不限制 | Only claim tasks no longer than this (seconds), unrestricted if None
+        :param duration_bin: 仅认领该时长分桶中的任务，None 表示时长未知的任务，False 表示不限制 | Only claim tasks in this duration bin, None means tasks of unknown duration, False means unrestricted
+        :return: 已认领的任务列表 | List of claimed tasks
+        """
+        async with self.get_session() as session:
+            try:
+                params = {"limit": max_concurrent_tasks}
+                if max_duration is None:
+                    stmt = _CLAIM_TASKS_STMT
+                else:
+                    stmt = _CLAIM_SHORT_TASKS_STMT
+                    params["max_duration"] = max_duration
+                if duration_bin is None:
+                    stmt = stmt.where(Task.duration_bin.is_(None))
+                elif duration_bin is not False:
+                    stmt = stmt.where(Task.duration_bin == duration_bin)
+                result = await session.execute(stmt, params)
+                tasks = result.scalars().all()
+                if tasks:
+                    await session.execute(
+                        update(Task)
+                        .where(Task.id.in_([task.id for task in tasks]))
+                        .values(status=TaskStatus.processing)
+                    )
+                await session.commit()
+                return tasks
+            except OperationalError:
+                self._is_connected = False
+                logger.error("Connection lost while claiming queued tasks. Attempting to reconnect.")
+                return await self.claim_queued_tasks(max_concurrent_tasks, max_duration, duration_bin)
+            except SQLAlchemyError as e:
+                logger.error(f"Error claiming queued tasks: {e}")
+                logger.error(traceback.format_exc())
+                await session.rollback()
+                raise
+
+    async def get_cached_result_task(self,
+                                     content_hash: str,
+                                     task_type: str,
+                                     engine_name: str,
+                                     decode_options: Optional[dict],
+                                     include_in_flight: bool = False
+                                     ) -> Optional[Task]:
+        """
+        根据文件内容哈希查找参数相同的任务，用于复用转录结果，已完成的任务优先于排队中或处理中的任务。
+
+        Find a task with the same file content hash and parameters, used to reuse transcription results,
+        completed tasks take precedence over queued or processing ones.
+
+        :param content_hash: 文件内容哈希 | File content hash
+        :param task_type: 任务类型 | Task type
+        :param engine_name: 引擎名称 | Engine name
+        :param decode_options: 解码选项 | Decode options
+        :param include_in_flight: 是否同时查找排队中或处理中的任务 | Whether to also look for queued or processing tasks
+        :return: 可复用的任务，未找到时返回 None | Reusable task, None if not found
+        """
+        statuses = [TaskStatus.completed]
+        if include_in_flight:
+            statuses += [TaskStatus.queued, TaskStatus.processing]
+        async with self.get_session() as session:
+            try:
+                # 仅查询候选任务的ID、状态和解码选项，避免为每个候选任务读取结果列 | Only select the ID, status and decode options of candidates, avoiding reading the result column of every candidate
+                result = await session.execute(
+                    select(Task.id, Task.status, Task.decode_options)
+                    .where(
+                        Task.content_hash == content_hash,
+                        Task.status.in_(statuses),
+                        Task.task_type == task_type,
+                        Task.engine_name == engine_name
+                    )
+                    .order_by(Task.id.desc())
+                )
+                # 解码选项为 JSON 列，不同数据库的 JSON 比较语义不一致，因此在 Python 中比较
+                # Decode options are stored as JSON whose comparison semantics differ between databases, so compare them in Python
+                in_flight_task_id = None
+                for task_id, status, task_decode_options in result.all():
+                    if task_decode_options != decode_options:
+                        continue
+                    if status == TaskStatus.completed:
+                        return await session.get(Task, task_id)
+                    if in_flight_task_id is None:
+                        in_flight_task_id = task_id
+                if in_flight_task_id is not None:
+                    return await session.get(Task, in_flight_task_id)
+                return None
+            except SQLAlchemyError as e:
+                logger.error(f"Error fetching cached result for hash {content_hash}: {e}")
+                logger.error(traceback.format_exc())
+                return None
+
     async def update_task(self, task_id: int, **kwargs) -> Optional[dict]:
         """
         异步更新任务信息
@@ -278,6 +471,104 @@ class DatabaseManager:
                 await session.rollback()
                 return None
 
+    async def bulk_update_tasks_by_id(self, updates: List[dict]) -> None:
+        """
+        异步批量更新多个任务，所有更新在一次事务中以 executemany 方式按主键执行。
+
+        Asynchronously update multiple tasks in bulk, executing all updates by primary key with executemany in one transaction.
+
+        :param updates: 更新字典列表，每项须包含任务的 'id' 字段 | List of update dictionaries, each must contain the task 'id'
+        :return: None
+        """
+        if not updates:
+            return
+        # 回调消息按列长度截断，与 update_task_callback_status 一致 | Truncate callback messages to the column length, matching update_task_callback_status
+        for row in updates:
+            if row.get("callback_message"):
+                row["callback_message"] = row["callback_message"][:512]
+        # 已完成任务的完整结果随本次更新保存，同一事务中删除其转录过程中保存的片段 | Completed tasks store their full result with this update, so delete the segments saved during transcription in the same transaction
+        completed_task_ids = [row["id"] for row in updates if row.get("status") == TaskStatus.completed]
+        async with self.get_session() as session:
+            try:
+                await session.execute(update(Task), updates)
+                if completed_task_ids:
+                    await session.execute(delete(TaskSegment).where(TaskSegment.task_id.in_(completed_task_ids)))
+                await session.commit()
+            except SQLAlchemyError as e:
+                logger.error(f"Error bulk updating tasks {[row.get('id') for row in updates]}: {e}")
+                logger.error(traceback.format_exc())
+                await session.rollback()
+                raise
+
+    async def add_task_segments(self, task_id: int, segments: List[dict]) -> None:
+        """
+        异步批量写入任务的转录片段，用于在转录过程中逐步保存结果。
+
+        Asynchronously bulk insert transcription segments of a task, used to persist results incrementally during transcription.
+
+        :param task_id: 任务ID | Task ID
+        :param segments: 片段字典列表 | List of segment dictionaries
+        :return: None
+        """
+        async with self.get_session() as session:
+            try:
+                session.add_all([
+                    TaskSegment(
+                        task_id=task_id,
+                        segment_id=segment.get('id'),
+                        start=segment.get('start'),
+                        end=segment.get('end'),
+                        text=segment.get('text')
+                    )
+                    for segment in segments
+                ])
+                await session.commit()
+            except SQLAlchemyError as e:
+                logger.error(f"Error adding segments for task ID {task_id}: {e}")
+                logger.error(traceback.format_exc())
+                await session.rollback()
+
+    async def delete_task_segments(self, task_id: int) -> None:
+        """
+        异步删除任务已保存的转录片段，任务被重新处理前调用，避免保留上一次处理的片段。
+
+        Asynchronously delete the saved transcription segments of a task, called before a task is processed again
+        so that segments of a previous run are not kept.
+
+        :param task_id: 任务ID | Task ID
+        :return: None
+        """
+        async with self.get_session() as session:
+            try:
+                await session.execute(delete(TaskSegment).where(TaskSegment.task_id == task_id))
+                await session.commit()
+            except SQLAlchemyError as e:
+                logger.error(f"Error deleting segments for task ID {task_id}: {e}")
+                logger.error(traceback.format_exc())
+                await session.rollback()
+
+    async def get_task_segments(self, task_id: int) -> List[dict]:
+        """
+        异步获取任务已保存的转录片段，任务处理中时可用于获取部分结果。
+
+        Asynchronously get the saved transcription segments of a task, can be used to get partial results while the task is processing.
+
+        :param task_id: 任务ID | Task ID
+        :return: 片段字典列表 | List of segment dictionaries
+        """
+        async with self.get_session() as session:
+            try:
+                result = await session.execute(
+                    select(TaskSegment)
+                    .where(TaskSegment.task_id == task_id)
+                    .order_by(TaskSegment.segment_id)
+                )
+                return [segment.to_dict() for segment in result.scalars().all()]
+            except SQLAlchemyError as e:
+                logger.error(f"Error fetching segments for task ID {task_id}: {e}")
+                logger.error(traceback.format_exc())
+                return []
+
     async def delete_task(self, task_id: int) -> bool:
         """
         根据ID异步删除任务
@@ -292,7 +583,9 @@ class DatabaseManager:
                 task = await session.get(Task, task_id)
                 if task:
                     await session.delete(task)
+                    await session.execute(delete(TaskSegment).where(TaskSegment.task_id == task_id))
                     await session.commit()
+                    await self._delete_unreferenced_result_files(session, [task.result_path])
                     return True
                 return False
             except SQLAlchemyError as e:
@@ -334,11 +627,15 @@ class DatabaseManager:
         """
         async with self.get_session() as session:
             try:
+                result_paths = []
                 for task_id in task_ids:
                     task = await session.get(Task, task_id)
                     if task:
+                        result_paths.append(task.result_path)
                         await session.delete(task)
+                await session.execute(delete(TaskSegment).where(TaskSegment.task_id.in_(task_ids)))
                 await session.commit()
+                await self._delete_unreferenced_result_files(session, result_paths)
                 logger.info(f"Bulk delete completed for {len(task_ids)} tasks.")
             except SQLAlchemyError as e:
                 logger.error(f"Error during bulk delete: {e}")
@@ -366,6 +663,7 @@ class DatabaseManager:
                 )
                 result = await session.execute(query)
                 tasks = result.scalars().all()
+                await self._load_task_results(tasks)
 
                 # 获取总记录数 | Get total count
                 count_query = select(func.count()).select_from(Task).where(and_(*conditions))
@@ -437,7 +735,8 @@ class DatabaseManager:
         if filters.engine_name:
             conditions.append(Task.engine_name == filters.engine_name)
         if filters.has_result is not None:
-            conditions.append(Task.result.isnot(None) if filters.has_result else Task.result.is_(None))
+            has_result = or_(Task.result.isnot(None), Task.result_path.isnot(None))
+            conditions.append(has_result if filters.has_result else not_(has_result))
         if filters.has_error is not None:
             conditions.append(Task.error_message.isnot(None) if filters.has_error else Task.error_message.is_(None))
         return conditions
@@ -460,10 +759,9 @@ class DatabaseManager:
                     callback_url=workflow_data.get("CALLBACK_URL"),
                 )
 
-                # 添加到会话并提交
+                # 添加到会话并 flush 获取 ID，工作流、通知和任务在同一个事务中提交
                 session.add(workflow)
-                await session.commit()
-                await session.refresh(workflow)  # 刷新获取 ID
+                await session.flush()
 
                 # 添加通知（如果有）
                 if "NOTIFY_ON_COMPLETION" in workflow_data:
@@ -35,7 +35,7 @@ from http import HTTPStatus
 from typing import Optional
 
 from pydantic import BaseModel, constr, Field, ConfigDict, field_validator
-from sqlalchemy import Column, Integer, String, Enum, Text, JSON, Float, DateTime
+from sqlalchemy import Column, Integer, String, Enum, Text, JSON, Float, DateTime, Index
 from sqlalchemy.types import Enum as SQLAlchemyEnum
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -130,17 +130,28 @@ class Task(TaskBase):
     file_size_bytes = Column(Integer, nullable=True)
     # 音频时长 | Audio duration
     file_duration = Column(Float, nullable=True)
+    # 音频时长分桶，时长未知时为空 | Audio duration bin, empty when the duration is unknown
+    duration_bin = Column(Integer, nullable=True, index=True)
+    # 文件内容哈希，用于复用相同文件的转录结果 | File content hash, used to reuse transcription results of identical files
+    content_hash = Column(String(64), nullable=True, index=True)
 
     # 解码选项 | Decode options
     decode_options = Column(JSON)
 
     # 结果 | Result
     result = Column(JSON, nullable=True)
+    # 结果文件路径，结果保存在文件中时使用 | Result file path, used when the result is stored in a file
+    result_path = Column(Text, nullable=True)
     # 错误信息 | Error message
     error_message = Column(Text, nullable=True)
     # 输出结果链接 | Output URL
     output_url = Column(String(255), nullable=True)
 
+    __table_args__ = (
+        # 认领排队任务时按状态和时长分桶定位，无需扫描已完成的任务 | Claiming queued tasks seeks by status and duration bin without scanning completed tasks
+        Index("ix_tasks_status_duration_bin_priority", "status", "duration_bin", "priority"),
+    )
+
     # 转换为字典 | Convert to dictionary
     def to_dict(self):
         return {
@@ -161,6 +172,7 @@ class Task(TaskBase):
             'file_name': self.file_name,
             'file_size_bytes': self.file_size_bytes,
             'file_duration': self.file_duration,
+            'content_hash': self.content_hash,
             'language': self.language,
             'platform': self.platform,
             'decode_options': self.decode_options,
@@ -170,6 +182,32 @@ class Task(TaskBase):
         }
 
 
+class TaskSegment(TaskBase):
+    __tablename__ = 'task_segments'
+
+    # 记录ID | Record ID
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # 所属任务ID | Owning task ID
+    task_id = Column(Integer, nullable=False, index=True)
+    # 片段序号 | Segment index
+    segment_id = Column(Integer, nullable=False)
+    # 开始时间（秒） | Start time (seconds)
+    start = Column(Float, nullable=False)
+    # 结束时间（秒） | End time (seconds)
+    end = Column(Float, nullable=False)
+    # 片段文本 | Segment text
+    text = Column(Text, nullable=True)
+
+    # 转换为字典 | Convert to dictionary
+    def to_dict(self):
+        return {
+            'id': self.segment_id,
+            'start': self.start,
+            'end': self.end,
+            'text': self.text
+        }
+
+
 # 查询任务的可选过滤器 | Query tasks optional filter
 class QueryTasksOptionalFilter(BaseModel):
     status: Optional[TaskStatus] = Field('completed',
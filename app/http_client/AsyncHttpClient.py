@@ -31,6 +31,7 @@
 
 import asyncio
 import traceback
+import aiofiles
 import httpx
 import json
 import re
@@ -189,9 +190,10 @@ class AsyncHttpClient:
             try:
                 async with self.aclient.stream("GET", url, headers=self.get_headers(url)) as response:
                     response.raise_for_status()
-                    with open(save_path, "wb") as file:
+                    # 逐块异步写入，磁盘写入不阻塞事件循环 | Write chunk by chunk asynchronously so disk writes do not block the event loop
+                    async with aiofiles.open(save_path, "wb") as file:
                         async for chunk in response.aiter_bytes(chunk_size):
-                            file.write(chunk)
+                            await file.write(chunk)
                     logger.info(f"File downloaded successfully: {save_path}")
             except (httpx.RequestError, httpx.HTTPStatusError) as error:
                 logger.error(f"Failed to download file from {url}: {error}", exc_info=True)
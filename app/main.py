@@ -99,18 +99,22 @@ async def lifespan(application: FastAPI):
         max_size=Settings.AsyncModelPoolSettings.max_size,
         max_instances_per_gpu=Settings.AsyncModelPoolSettings.max_instances_per_gpu,
         init_with_max_pool_size=Settings.AsyncModelPoolSettings.init_with_max_pool_size,
+        warmup_on_load=Settings.AsyncModelPoolSettings.warmup_on_load,
+        use_process_pool_on_cpu=Settings.WhisperServiceSettings.USE_PROCESS_POOL_ON_CPU,
 
         # openai_whisper 引擎设置 | openai_whisper Engine Settings
         openai_whisper_model_name=Settings.OpenAIWhisperSettings.openai_whisper_model_name,
         openai_whisper_device=Settings.OpenAIWhisperSettings.openai_whisper_device,
         openai_whisper_download_root=Settings.OpenAIWhisperSettings.openai_whisper_download_root,
         openai_whisper_in_memory=Settings.OpenAIWhisperSettings.openai_whisper_in_memory,
+        openai_whisper_compile_encoder=Settings.OpenAIWhisperSettings.openai_whisper_compile_encoder,
 
         # faster_whisper 引擎设置 | faster_whisper Engine Settings
         faster_whisper_model_size_or_path=Settings.FasterWhisperSettings.faster_whisper_model_size_or_path,
         faster_whisper_device=Settings.FasterWhisperSettings.faster_whisper_device,
         faster_whisper_device_index=Settings.FasterWhisperSettings.faster_whisper_device_index,
         faster_whisper_compute_type=Settings.FasterWhisperSettings.faster_whisper_compute_type,
+        faster_whisper_cpu_compute_type=Settings.FasterWhisperSettings.faster_whisper_cpu_compute_type,
         faster_whisper_cpu_threads=Settings.FasterWhisperSettings.faster_whisper_cpu_threads,
         faster_whisper_num_workers=Settings.FasterWhisperSettings.faster_whisper_num_workers,
         faster_whisper_download_root=Settings.FasterWhisperSettings.faster_whisper_download_root
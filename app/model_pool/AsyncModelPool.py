@@ -31,18 +31,18 @@
 
 import torch
 import gc
+import numpy as np
 import asyncio
 import threading
 import traceback
 import datetime
 
 from asyncio import Queue
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from app.model_pool.model_loader import load_openai_whisper_model
 from app.utils.logging_utils import configure_logging
 
-# OpenAI Whisper 模型 | OpenAI Whisper model
-import whisper
-
 # Faster-Whisper 模型 | Faster-Whisper model
 from faster_whisper import WhisperModel
 
@@ -77,12 +77,16 @@ class AsyncModelPool:
                  faster_whisper_cpu_threads: int,
                  faster_whisper_num_workers: int,
                  faster_whisper_download_root: Optional[str],
+                 faster_whisper_cpu_compute_type: str = "int8",
+                 openai_whisper_compile_encoder: bool = False,
 
                  # 模型池设置 | Model Pool Settings
                  min_size: int = 1,
                  max_size: int = 1,
                  max_instances_per_gpu: int = 1,
                  init_with_max_pool_size: bool = True,
+                 warmup_on_load: bool = True,
+                 use_process_pool_on_cpu: bool = False,
                  ):
         """
         异步模型池，用于管理多个异步模型实例，并且会根据当前系统的 GPU 数量和 CPU 性能自动纠正错误的初始化参数，这个类是线程安全的。
@@ -103,6 +107,8 @@ class AsyncModelPool:
         :param faster_whisper_cpu_threads: 模型使用的CPU线程数，设置为 0 时使用所有可用的CPU线程 | The number of CPU threads used by the model, set to 0 to use all available CPU threads
         :param faster_whisper_num_workers: 模型worker数 | Model worker count
         :param faster_whisper_download_root: 模型下载根目录 | Model download root directory
+        :param faster_whisper_cpu_compute_type: 在 CPU 上运行时的模型推理计算类型 | Model inference calculation type when running on CPU
+        :param openai_whisper_compile_encoder: 是否在 GPU 上使用 torch.compile 编译编码器 | Whether to compile the encoder with torch.compile on GPU
 
         :param min_size: 模型池的最小大小 | Minimum pool size
         :param max_size: 模型池的最大大小 | Maximum pool size
@@ -110,6 +116,8 @@ class AsyncModelPool:
         :param init_with_max_pool_size: 是否在模型池初始化时以最大并发任务数创建模型实例 |
                                                 Whether to create model instances with the maximum number of concurrent tasks
                                                 when the model pool is initialized
+        :param warmup_on_load: 是否在模型加载后执行一次预热推理 | Whether to run one warm-up inference after loading a model
+        :param use_process_pool_on_cpu: 是否在 CPU 上使用进程池执行 openai_whisper 转录，此时模型由工作进程加载 | Whether to run openai_whisper transcription in a process pool on the CPU, the models are then loaded by the worker processes
         """
 
         # 防止重复初始化 | Prevent re-initialization
@@ -127,11 +135,21 @@ class AsyncModelPool:
         # 检查是否有多个可用的 GPU | Check if multiple GPUs are available
         self.num_gpus = torch.cuda.device_count() if torch.cuda.is_available() else 0
 
+        # 在 Ampere 及更新的 GPU 上允许 TF32 矩阵乘法，并让 cuDNN 为固定形状的卷积选择最快算法
+        # Allow TF32 matmuls on Ampere and newer GPUs, and let cuDNN pick the fastest algorithm for the fixed-shape convolutions
+        if self.num_gpus > 0:
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+
         # openai_whisper 引擎设置 | openai_whisper Engine Settings
         self.openai_whisper_model_name = openai_whisper_model_name
         self.openai_whisper_device = openai_whisper_device
         self.openai_whisper_download_root = openai_whisper_download_root
         self.openai_whisper_in_memory = openai_whisper_in_memory
+        self.openai_whisper_compile_encoder = openai_whisper_compile_encoder
+        self.warmup_on_load = warmup_on_load
+        self.use_process_pool_on_cpu = use_process_pool_on_cpu
 
         # faster_whisper 引擎设置 | faster_whisper Engine Settings
         self.fast_whisper_model_size_or_path = faster_whisper_model_size_or_path
@@ -141,6 +159,7 @@ class AsyncModelPool:
         self.fast_whisper_cpu_threads = faster_whisper_cpu_threads
         self.fast_whisper_num_workers = faster_whisper_num_workers
         self.fast_whisper_download_root = faster_whisper_download_root
+        self.fast_whisper_cpu_compute_type = faster_whisper_cpu_compute_type
 
         self.min_size = min_size
         self.max_size = self.get_optimal_max_size(max_size)
@@ -178,18 +197,18 @@ class AsyncModelPool:
                 # 单 GPU 情况，分配到 GPU 0 并使用 float16 | Single GPU case, assign to GPU 0 with float16
                 allocation["device"] = "cuda"
                 allocation["device_index"] = 0 if model_type == "faster_whisper" else None
-                allocation["compute_type"] = self.fast_whisper_compute_type if model_type == "faster_whisper" else "N/A"
+                allocation["compute_type"] = self.get_gpu_compute_type(0) if model_type == "faster_whisper" else "N/A"
             else:
                 # 多 GPU 情况下考虑 max_instances_per_gpu 限制 | Consider max_instances_per_gpu in multi-GPU setup
                 total_instances_per_gpu = self.max_instances_per_gpu
                 gpu_index = (instance_index // total_instances_per_gpu) % self.num_gpus
                 allocation["device"] = "cuda" if model_type == "faster_whisper" else f"cuda:{gpu_index}"
                 allocation["device_index"] = gpu_index if model_type == "faster_whisper" else None
-                allocation["compute_type"] = self.fast_whisper_compute_type if model_type == "faster_whisper" else "N/A"
+                allocation["compute_type"] = self.get_gpu_compute_type(gpu_index) if model_type == "faster_whisper" else "N/A"
         else:
-            # 无 GPU 情况，分配到 CPU 并使用 float32 | No GPU case, assign to CPU with float32
+            # 无 GPU 情况，分配到 CPU 并使用 CPU 计算类型（默认 int8） | No GPU case, assign to CPU with the CPU compute type (int8 by default)
             allocation["device"] = "cpu"
-            allocation["compute_type"] = "float32" if model_type == "faster_whisper" else "N/A"
+            allocation["compute_type"] = self.fast_whisper_cpu_compute_type if model_type == "faster_whisper" else "N/A"
 
         # 构建日志信息，包含系统上下文信息 | Build log information, including system context
         gpu_message = (
@@ -220,6 +239,46 @@ class AsyncModelPool:
 
         return allocation
 
+    def get_gpu_compute_type(self, gpu_index: int) -> str:
+        """
+        返回 faster_whisper 在指定 GPU 上的计算类型，设置为 "auto" 时根据 GPU 的计算能力选择。
+
+        Return the faster_whisper compute type for the given GPU, chosen from the GPU compute capability when set to "auto".
+
+        :param gpu_index: GPU 索引 | GPU index
+        :return: 计算类型 | Compute type
+        """
+        if self.fast_whisper_compute_type != "auto":
+            return self.fast_whisper_compute_type
+        capability = torch.cuda.get_device_capability(gpu_index)
+        # Turing 及更新的 GPU 支持 INT8 张量核心 | Turing and newer GPUs have INT8 tensor cores
+        if capability >= (7, 5):
+            return "int8_float16"
+        # Volta 仅支持 FP16 张量核心 | Volta only has FP16 tensor cores
+        if capability >= (7, 0):
+            return "float16"
+        # 更早的 GPU 没有高效的 FP16 计算，Pascal 支持 INT8 点积指令 | Older GPUs lack efficient FP16, Pascal has INT8 dot-product instructions
+        if capability >= (6, 1):
+            return "int8"
+        return "float32"
+
+    def should_use_process_pool(self) -> bool:
+        """
+        判断是否应使用进程池执行转录：仅在启用设置、引擎为 openai_whisper 且运行在 CPU 上时使用。
+        faster_whisper (CTranslate2) 在推理时会释放 GIL，线程池即可并行。
+
+        Determines whether transcription should run in a process pool: only when enabled in settings,
+        the engine is openai_whisper and inference runs on the CPU.
+        faster_whisper (CTranslate2) releases the GIL during inference, so a thread pool already runs in parallel.
+
+        :return: 是否使用进程池 | Whether to use the process pool
+        """
+        if not self.use_process_pool_on_cpu:
+            return False
+        if self.engine != "openai_whisper":
+            return False
+        return self.num_gpus == 0 or self.openai_whisper_device == "cpu"
+
     def get_optimal_max_size(self, max_size: int) -> int:
         """
         根据当前系统的 GPU 数量、CPU 性能和用户设置的最大池大小，返回最优的 max_size。
@@ -266,6 +325,12 @@ class AsyncModelPool:
         Initialize the model pool asynchronously by loading the minimum number of model instances in batches
         to reduce concurrent download conflicts.
         """
+        # 使用进程池时模型由各工作进程加载，池中不创建实例，避免常驻内存翻倍
+        # With the process pool the models are loaded by the worker processes, so no instances are created in the pool to avoid doubling resident memory
+        if self.should_use_process_pool():
+            self.logger.info("Transcription runs in worker processes, skipping in-process model creation.")
+            return
+
         instances_to_create = self.max_size if self.init_with_max_pool_size else self.min_size
         # 每批加载的实例数，用于减少并发冲突 | Number of instances to load per batch to reduce concurrent conflicts
         batch_size = 1
@@ -341,17 +406,27 @@ class AsyncModelPool:
                 end_time = datetime.datetime.now()
             elif self.engine == "openai_whisper":
                 start_time = datetime.datetime.now()
+                # 以 mmap 方式加载权重，CPU 上的多个实例共享同一份权重 | Load the weights with mmap, so multiple CPU instances share one copy of them
                 model = await asyncio.to_thread(
-                    whisper.load_model,
+                    load_openai_whisper_model,
                     self.openai_whisper_model_name,
                     device=device_allocation["device"],
                     download_root=self.openai_whisper_download_root,
                     in_memory=self.openai_whisper_in_memory
                 )
+                # 编码器输入固定为 30 秒的梅尔频谱，形状不变，适合编译；解码器的 KV 缓存逐步增长，不进行编译
+                # The encoder always takes a 30 second mel spectrogram with a fixed shape, which suits compilation;
+                # the decoder KV cache grows step by step, so it is not compiled
+                if self.openai_whisper_compile_encoder and model.device.type == "cuda":
+                    model.encoder = torch.compile(model.encoder)
                 end_time = datetime.datetime.now()
             else:
                 raise ValueError("Invalid engine specified. Choose 'openai_whisper' or 'faster_whisper'.")
 
+            # 放入池中前预热，首个请求不会承担内核选择和编译的开销 | Warm up before pooling, so the first request does not pay for kernel selection and compilation
+            if self.warmup_on_load:
+                await asyncio.to_thread(self._warm_up_model, model)
+
             # 将模型放入池中 | Put model into the pool
             await self.pool.put(model)
 
@@ -377,6 +452,34 @@ class AsyncModelPool:
             self.logger.error(f"Failed to create and add model instance to the pool: {e}")
             self.logger.debug(traceback.format_exc())
 
+    def _warm_up_model(self, model: Any) -> None:
+        """
+        对一秒静音执行一次推理，触发 cuDNN/cuBLAS 的内核选择、torch.compile 编译和 CTranslate2 的首次初始化。
+        预热失败只记录日志，不影响模型入池。
+
+        Run one inference over a second of silence, triggering cuDNN/cuBLAS kernel selection, torch.compile
+        compilation and the first-run initialization of CTranslate2. A failed warm-up is only logged and does not
+        keep the model out of the pool.
+
+        :param model: 模型实例 | Model instance
+        :return: None
+        """
+        silence = np.zeros(16000, dtype=np.float32)
+        try:
+            start_time = datetime.datetime.now()
+            if self.engine == "faster_whisper":
+                # transcribe 返回惰性生成器，需要消费才会真正解码 | transcribe returns a lazy generator, it must be consumed to actually decode
+                segments, _ = model.transcribe(silence, language="en", beam_size=1)
+                for _ in segments:
+                    pass
+            else:
+                model.transcribe(silence, language="en", fp16=model.device.type == "cuda")
+            time_taken = (datetime.datetime.now() - start_time).total_seconds()
+            self.logger.info(f"Model warm-up finished in {time_taken:.2f} seconds.")
+        except Exception as e:
+            self.logger.warning(f"Model warm-up failed: {e}")
+            self.logger.debug(traceback.format_exc())
+
     async def get_model(self, timeout: Optional[float] = 5.0, strategy: str = "existing"):
         """
         异步获取模型实例。如果池为空且未达到最大大小，则按指定策略创建新的模型实例。
@@ -497,6 +600,24 @@ class AsyncModelPool:
             self.logger.error(f"An unexpected error occurred while returning model to pool: {str(e)}", exc_info=True)
             await self._destroy_model(model)
 
+    @asynccontextmanager
+    async def lease(self, timeout: Optional[float] = 5.0, strategy: str = "existing") -> AsyncIterator[Any]:
+        """
+        以异步上下文管理器的形式租用模型实例，无论是否发生异常，退出时都会将其归还到池中。
+
+        Lease a model instance as an async context manager, the instance is returned to the pool on exit
+        whether or not an exception was raised.
+
+        :param timeout: 等待获取模型实例的超时时间（秒） | Timeout in seconds for waiting to retrieve a model instance
+        :param strategy: 获取模型的策略 ("existing", "dynamic") | Strategy for retrieving a model instance ("existing", "dynamic")
+        :return: 模型实例 | Model instance
+        """
+        model = await self.get_model(timeout=timeout, strategy=strategy)
+        try:
+            yield model
+        finally:
+            await self.return_model(model)
+
     async def _is_model_healthy(self, model):
         """
         异步检查模型实例是否健康。
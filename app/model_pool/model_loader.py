@@ -0,0 +1,104 @@
+# ==============================================================================
+# Copyright (C) 2024 Evil0ctal
+#
+# This file is part of the Whisper-Speech-to-Text-API project.
+# Github: https://github.com/Evil0ctal/Whisper-Speech-to-Text-API
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#                                     ,
+#              ,-.       _,---._ __  / \
+#             /  )    .-'       `./ /   \
+#            (  (   ,'            `/    /|
+#             \  `-"             \'\   / |
+#              `.              ,  \ \ /  |
+#               /`.          ,'-`----Y   |
+#              (            ;        |   '
+#              |  ,-.    ,-'         |  /
+#              |  | (   |  Evil0ctal | /
+#              )  |  \  `.___________|/    Whisper API Out of the Box (Where is my ⭐?)
+#              `--'   `--'
+# ==============================================================================
+
+
+import os
+from typing import Optional
+
+
+def load_openai_whisper_model(model_name: str, device: str, download_root: Optional[str], in_memory: bool):
+    """
+    加载 OpenAI Whisper 模型，不要求全部读入内存时优先以 mmap 方式加载权重。
+
+    Load an OpenAI Whisper model, preferring to mmap the weights when they are not required to be read into memory.
+
+    :param model_name: 模型名称或权重文件路径 | Model name or checkpoint file path
+    :param device: 设备名称，如 "cpu" 或 "cuda" | Device name, e.g. "cpu" or "cuda"
+    :param download_root: 模型下载根目录 | Model download root directory
+    :param in_memory: 是否在内存中加载模型 | Whether to load the model in memory
+    :return: OpenAI Whisper 模型实例 | OpenAI Whisper model instance
+    """
+    import whisper
+    if not in_memory:
+        try:
+            return load_openai_whisper_model_mmap(model_name, download_root).to(device)
+        except Exception:
+            # 旧版 PyTorch 或非 zip 格式的权重不支持 mmap，回退到常规加载 | Older PyTorch or non-zip checkpoints do not support mmap, fall back to a regular load
+            pass
+    return whisper.load_model(model_name, device=device, download_root=download_root, in_memory=in_memory)
+
+
+def load_openai_whisper_model_mmap(model_name: str, download_root: Optional[str]):
+    """
+    以 mmap 方式在 CPU 上加载 OpenAI Whisper 权重，同一台机器上的所有实例共享操作系统页缓存中的同一份权重，而不是各自复制一份。
+    与模型参数类型不一致的权重（如 fp16 权重）会被转换为模型的类型，这部分权重无法共享。
+
+    Load OpenAI Whisper weights on the CPU with mmap, so all instances on the same host share the same weights
+    in the OS page cache instead of each holding a private copy.
+    Weights whose dtype differs from the model parameters (e.g. fp16 checkpoints) are converted to the model's dtype and are not shared.
+
+    :param model_name: 模型名称或权重文件路径 | Model name or checkpoint file path
+    :param download_root: 模型下载根目录 | Model download root directory
+    :return: OpenAI Whisper 模型实例 | OpenAI Whisper model instance
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    if download_root is None:
+        default = os.path.join(os.path.expanduser("~"), ".cache")
+        download_root = os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
+
+    if model_name in whisper._MODELS:
+        checkpoint_file = whisper._download(whisper._MODELS[model_name], download_root, False)
+        alignment_heads = whisper._ALIGNMENT_HEADS[model_name]
+    elif os.path.isfile(model_name):
+        checkpoint_file = model_name
+        alignment_heads = None
+    else:
+        raise RuntimeError(f"Model {model_name} not found; available models = {whisper.available_models()}")
+
+    checkpoint = torch.load(checkpoint_file, map_location="cpu", mmap=True)
+    model = Whisper(ModelDimensions(**checkpoint["dims"]))
+    # 官方权重以 fp16 保存，而模型参数为 fp32（LayerNorm 等按 fp32 计算），类型不一致的张量先转换为模型的类型，
+    # 只有类型一致的张量（如 fp32 权重）才能直接使用 mmap 映射的内存
+    # Official checkpoints are stored in fp16 while the model parameters are fp32 (LayerNorm and others compute in fp32),
+    # so tensors of a different dtype are converted to the model's dtype first, only tensors of a matching dtype (e.g. fp32 checkpoints) keep using the mmap memory
+    model_state = model.state_dict()
+    state_dict = {
+        key: value.to(model_state[key].dtype) if key in model_state and value.dtype != model_state[key].dtype else value
+        for key, value in checkpoint["model_state_dict"].items()
+    }
+    # assign=True 直接使用上述张量作为参数，避免再复制一次 | assign=True uses the tensors above as parameters instead of copying them once more
+    model.load_state_dict(state_dict, assign=True)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model.eval()
@@ -30,24 +30,30 @@
 # ==============================================================================
 
 import asyncio
-import datetime
+import json
+import multiprocessing
 import os
 import threading
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Any, Iterable, Optional
+import weakref
+import torch
+import whisper
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import List, Any, Iterable, Iterator, Optional, Coroutine, Union
 
 from app.database.DatabaseManager import DatabaseManager
 from app.database.models.TaskModels import Task, TaskStatus
 from app.model_pool.AsyncModelPool import AsyncModelPool
+from app.processors.transcription_worker import initialize_worker, ping_worker, transcribe_in_worker
 from app.services.callback_service import CallbackService
 from app.utils.file_utils import FileUtils
 from app.utils.logging_utils import configure_logging
+from app.utils.result_utils import save_result_file
 from config.settings import Settings
-
-# 初始化静态线程池，所有实例共享 | Initialize static thread pool, shared by all instances
-_executor: ThreadPoolExecutor = ThreadPoolExecutor()
+from faster_whisper import BatchedInferencePipeline, decode_audio
+from whisper.tokenizer import get_tokenizer
 
 
 class TaskProcessor:
@@ -94,13 +100,63 @@ class TaskProcessor:
         self.cleanup_queue = asyncio.Queue()
         # 创建回调队列 | Create callback queue
         self.callback_queue = asyncio.Queue()
-        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        # 事件循环在后台线程中创建，以便优先使用 uvloop | The event loop is created in the background thread so uvloop can be used when available
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.thread: threading.Thread = threading.Thread(target=self.run_loop)
         self.logger = configure_logging(name=__name__)
         self.shutdown_event: threading.Event = threading.Event()
+        # 新任务通知事件，有新任务入库时立即唤醒任务拉取 | New task event, wakes up task fetching as soon as a new task is stored
+        self.new_task_event: asyncio.Event = asyncio.Event()
         self.callback_service: CallbackService = CallbackService()
+        # 限制并发的外部回调请求数量 | Cap the number of concurrent outbound callback requests
+        self._callback_semaphore: asyncio.Semaphore = asyncio.Semaphore(100)
+        # 保存正在执行的回调任务引用，防止被垃圾回收 | Keep references to in-flight callback tasks so they are not garbage collected
+        self._callback_tasks: set = set()
+        # 正在执行的转录任务及其占用的槽位数和长任务槽位数，用于按空闲槽位认领新任务
+        # In-flight transcription tasks with the slots and long-task slots they occupy, used to claim new tasks per free slot
+        self._in_flight_tasks: dict = {}
         self.max_concurrent_tasks: int = max_concurrent_tasks
+        # 为短音频任务保留的槽位数，至少留一个槽位给长任务，并发数为 1 时不保留 | Slots reserved for short audio tasks, at least one slot is left for long tasks, none are reserved with a concurrency of 1
+        self.short_task_reserved_slots: int = max(0, min(Settings.WhisperServiceSettings.SHORT_TASK_RESERVED_SLOTS,
+                                                         self.max_concurrent_tasks - 1))
+        self.short_task_max_duration: float = Settings.WhisperServiceSettings.SHORT_TASK_MAX_DURATION
+        # 时长分桶边界及下一次认领的分桶序号 | Duration bin edges and the index of the bin to claim from next
+        self.duration_bin_edges: List[float] = Settings.WhisperServiceSettings.DURATION_BIN_EDGES
+        self._next_bin_index: int = 0
         self.task_status_check_interval: int = task_status_check_interval
+        # 空闲轮询的等待时间，从 0.1 秒开始指数增长至任务状态检查间隔 | Idle polling delay, grows exponentially from 0.1 seconds up to the task status check interval
+        self._idle_delay: float = 0.1
+        # faster_whisper 批量推理的批大小，0 表示禁用 | Batch size for faster_whisper batched inference, 0 disables it
+        self.batch_size: int = Settings.FasterWhisperSettings.faster_whisper_batch_size
+        # 每个模型实例复用的批量推理管线，模型被销毁时自动移除 | Batched inference pipeline reused per model instance, removed automatically when the model is destroyed
+        self._batched_pipelines: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # faster_whisper 请求未指定束搜索宽度时的默认值 | Default faster_whisper beam size when the request does not specify one
+        self.beam_size: int = Settings.FasterWhisperSettings.faster_whisper_beam_size
+        # 转录过程中每累计多少个片段写入一次数据库 | Number of segments accumulated before each incremental database write during transcription
+        self.segment_flush_size: int = 50
+        # 每个处理器独立的线程池，避免多个处理器争用同一个全局线程池 | Per-processor thread pool, avoids processors contending for a shared global pool
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_tasks,
+            thread_name_prefix="asr"
+        )
+        # 文件预读线程池，用于在转录当前任务时预热下一个任务的文件缓存 | File prefetch pool, warms the next task's file cache while the current one transcribes
+        self._prefetch_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="asr-prefetch"
+        )
+        # CPU 上的 openai_whisper 推理受 GIL 限制，改用多进程执行转录 | CPU-bound openai_whisper inference is serialized by the GIL, so run it in worker processes
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        if self.model_pool.should_use_process_pool():
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrent_tasks,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initialize_worker,
+                initargs=(
+                    self.model_pool.openai_whisper_model_name,
+                    self.model_pool.openai_whisper_download_root,
+                    self.model_pool.openai_whisper_in_memory
+                )
+            )
 
     def start(self) -> None:
         """
@@ -110,6 +166,12 @@ class TaskProcessor:
 
         :return: None
         """
+        # 预热线程池，提前创建工作线程，避免首批任务承担线程创建开销 | Pre-warm the thread pool so the first batch does not pay thread-creation cost
+        list(self._executor.map(lambda _: None, range(self.max_concurrent_tasks)))
+        # 提前启动转录进程并加载模型，无需等待完成 | Spawn the transcription processes and load their models ahead of time without waiting
+        if self._process_executor is not None:
+            for _ in range(self.max_concurrent_tasks):
+                self._process_executor.submit(ping_worker)
         self.thread.start()
         self.logger.info("TaskProcessor started.")
 
@@ -123,9 +185,15 @@ class TaskProcessor:
         """
         self.shutdown_event.set()
         # 以线程安全的方式停止事件循环 | Stop the event loop in a thread-safe manner
-        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
         # 等待线程结束 | Wait for the thread to finish
         self.thread.join()
+        # 关闭线程池 | Shut down the thread pool
+        self._executor.shutdown(wait=True)
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=True)
         self.logger.info("TaskProcessor stopped.")
 
     def run_loop(self) -> None:
@@ -134,6 +202,12 @@ class TaskProcessor:
 
         Runs the asynchronous event loop in the background to process the task queue until a stop signal is triggered.
         """
+        # 如果安装了 uvloop 则使用 uvloop，否则使用默认事件循环 | Use uvloop if installed, otherwise fall back to the default event loop
+        try:
+            import uvloop
+            self.loop = uvloop.new_event_loop()
+        except ImportError:
+            self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
 
         # 在事件循环中初始化数据库管理器
@@ -176,7 +250,10 @@ class TaskProcessor:
         self.db_manager = DatabaseManager(
             database_type=self.database_type,
             database_url=self.database_url,
-            loop=self.loop
+            loop=self.loop,
+            # 按并发任务数调整连接池大小，应对工作线程的突发数据库访问 | Size the pool by task concurrency to absorb bursts of worker database access
+            pool_size=max(5, self.max_concurrent_tasks * 2),
+            max_overflow=max(10, self.max_concurrent_tasks)
         )
         await self.db_manager.initialize()  # 确保连接池绑定到 TaskProcessor 的事件循环
 
@@ -187,23 +264,54 @@ class TaskProcessor:
         Processes database query requests in the fetch_queue
         """
         while not self.shutdown_event.is_set():
-            # 从 fetch_queue 中获取请求（阻塞等待） | Get request from fetch_queue (blocking wait)
-            await self.fetch_queue.get()
+            # 从 fetch_queue 中获取要认领的任务数量和时长上限（阻塞等待） | Get the number of tasks to claim and the duration cap from fetch_queue (blocking wait)
+            limit, max_duration = await self.fetch_queue.get()
+            tasks: List[Task] = []
             try:
-                # 执行数据库查询
-                tasks = await self.db_manager.get_queued_tasks(self.max_concurrent_tasks)
-                for task in tasks:
-                    # 将任务状态更新为处理中 | Update task status to processing
-                    await self.db_manager.update_task(task.id, status=TaskStatus.processing)
-                # 将结果放入 task_result_queue 中 | Put the result into task_result_queue
-                await self.task_processing_queue.put(tasks)
+                # 原子地认领排队任务并标记为处理中 | Atomically claim queued tasks and mark them as processing
+                tasks = await self._claim_tasks(limit, max_duration)
             except Exception as e:
                 self.logger.error(f"Error fetching tasks from database: {str(e)}")
                 self.logger.error(traceback.format_exc())
             finally:
+                # 将结果放入 task_result_queue 中，出错时放入空列表以免处理协程一直等待
+                # Put the result into task_result_queue, an empty list on error so the processing coroutine does not wait forever
+                await self.task_processing_queue.put(tasks)
                 # 标记查询完成 | Mark the query as completed
                 self.fetch_queue.task_done()
 
+    async def _claim_tasks(self, limit: int, max_duration: Optional[float]) -> List[Task]:
+        """
+        认领排队任务。启用时长分桶时，从上次之后的分桶开始轮流查找，每次只从一个分桶认领，
+        使同时处理的任务时长相近；时长未知的任务每次只认领一个。
+
+        Claims queued tasks. With duration binning enabled, the bins are searched in turn starting after the last one
+        used, and each claim takes tasks from a single bin so that concurrently processed tasks have similar durations;
+        tasks of unknown duration are claimed one at a time.
+
+        :param limit: 最多认领的任务数量 | Maximum number of tasks to claim
+        :param max_duration: 仅认领时长不超过该值（秒）的任务，为 None 时不限制 | Only claim tasks no longer than this (seconds), unrestricted if None
+        :return: 已认领的任务列表 | List of claimed tasks
+        """
+        if not self.duration_bin_edges:
+            return await self.db_manager.claim_queued_tasks(limit, max_duration)
+
+        # 分桶序号 0..len(edges) 对应已知时长，最后的 None 对应时长未知 | Bins 0..len(edges) are known durations, the trailing None is unknown duration
+        bins: List[Optional[int]] = list(range(len(self.duration_bin_edges) + 1)) + [None]
+        for offset in range(len(bins)):
+            bin_index = (self._next_bin_index + offset) % len(bins)
+            duration_bin = bins[bin_index]
+            # 跳过下界已超过时长上限的分桶 | Skip bins whose lower edge is already above the duration cap
+            if max_duration is not None and (duration_bin is None or (
+                    duration_bin > 0 and self.duration_bin_edges[duration_bin - 1] > max_duration)):
+                continue
+            tasks = await self.db_manager.claim_queued_tasks(limit if duration_bin is not None else 1,
+                                                             max_duration, duration_bin)
+            if tasks:
+                self._next_bin_index = bin_index + 1
+                return tasks
+        return []
+
     async def cleanup_worker(self) -> None:
         """
         异步清理工作协程，从队列中获取任务并执行文件删除和回调。
@@ -217,9 +325,16 @@ class TaskProcessor:
             try:
                 # 删除临时文件 | Delete temporary file
                 if Settings.FileSettings.delete_temp_files_after_processing and task.file_path:
-                    await self.file_utils.delete_file(task.file_path)
+                    # 单次 unlink 仅需微秒级，直接同步调用，无需经由线程池 | A single unlink takes microseconds, call it directly instead of via a thread pool
+                    try:
+                        os.unlink(task.file_path)
+                        self.logger.debug("Deleted temporary file: %s", task.file_path)
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        self.logger.warning(f"Failed to delete temporary file {task.file_path}: {e}")
                 else:
-                    self.logger.debug(f"Keeping temporary file: {task.file_path}")
+                    self.logger.debug("Keeping temporary file: %s", task.file_path)
 
             except Exception as e:
                 self.logger.error(f"Error during cleanup for task ID {task.id}: {e}")
@@ -229,44 +344,73 @@ class TaskProcessor:
 
     async def callback_worker(self) -> None:
         """
-        异步回调工作协程，从队列中获取回调任务并执行回调通知。
+        异步回调工作协程，从队列中获取回调任务并以非阻塞方式发送回调通知。
 
-        Asynchronous callback worker coroutine that takes callback tasks from the queue and performs callback notifications.
+        Asynchronous callback worker coroutine that takes callback tasks from the queue and sends callback notifications without blocking.
         """
         while not self.shutdown_event.is_set():
             callback_task = await self.callback_queue.get()
             task = callback_task["task"]
 
             try:
-                # 发送回调通知 | Send callback notification
+                # 发送回调通知，不等待其完成，避免慢速回调阻塞后续任务 | Send callback notification without awaiting it, so slow callbacks do not block the queue
                 if task.callback_url:
-                    await self.callback_service.task_callback_notification(task=task, db_manager=self.db_manager)
+                    callback = self.loop.create_task(self._send_callback(task))
+                    self._callback_tasks.add(callback)
+                    callback.add_done_callback(self._callback_tasks.discard)
+            finally:
+                self.callback_queue.task_done()
+
+    async def _send_callback(self, task: Task) -> None:
+        """
+        在并发限制内发送单个任务的回调通知。
+
+        Sends the callback notification for a single task within the concurrency limit.
 
+        :param task: 要发送回调通知的任务实例 | Task instance to send callback notification for
+        :return: None
+        """
+        async with self._callback_semaphore:
+            try:
+                callback_status = await self.callback_service.task_callback_notification(
+                    task=task, db_manager=self.db_manager, persist_status=False
+                )
+                # 回调状态与任务状态一起走批量更新，不再单独提交 | Callback status goes through the bulk update with task status instead of its own commit
+                if callback_status:
+                    self.update_queue.put_nowait((task.id, callback_status))
             except Exception as e:
                 self.logger.error(f"Error during callback for task ID {task.id}: {e}")
                 self.logger.error(traceback.format_exc())
-            finally:
-                self.callback_queue.task_done()
 
     async def update_task_worker(self):
         """
-        异步处理更新队列中的数据库操作
+        异步处理更新队列中的数据库操作，将队列中已积累的更新合并为一次批量写入。
 
-        Asynchronously processes database operations in the update queue
+        Asynchronously processes database operations in the update queue, merging the updates already queued into one bulk write.
         """
         while not self.shutdown_event.is_set():
             task_id, update_data = await self.update_queue.get()
+            updates = [{"id": task_id, **update_data}]
+            # 取出同时完成的其他任务的更新，一起提交 | Drain updates of tasks that finished at the same time and commit them together
+            while not self.update_queue.empty():
+                task_id, update_data = self.update_queue.get_nowait()
+                updates.append({"id": task_id, **update_data})
             try:
-                await self.db_manager.update_task(task_id, **update_data)
-                self.update_queue.task_done()
+                await self.db_manager.bulk_update_tasks_by_id(updates)
             except Exception as e:
-                self.logger.error(f"Error updating task {task_id}: {str(e)}")
+                self.logger.error(f"Error updating tasks {[row['id'] for row in updates]}: {str(e)}")
+            finally:
+                for _ in updates:
+                    self.update_queue.task_done()
 
     async def process_tasks_worker(self) -> None:
         """
-        持续从数据库中按优先级拉取任务并处理。若无任务，则等待并重试。
+        持续从数据库中按优先级拉取任务并处理。每当有工作线程空闲就立即认领新任务，
+        使高优先级任务无需等待整批任务完成。若无任务，则等待并重试。
 
-        Continuously fetches tasks from the database by priority and processes them. Waits and retries if no tasks are available.
+        Continuously fetches tasks from the database by priority and processes them. New tasks are claimed as soon
+        as a worker becomes free, so high-priority tasks do not wait for a whole batch to finish.
+        Waits and retries if no tasks are available.
 
         :return: None
         """
@@ -277,78 +421,424 @@ class TaskProcessor:
 
         while not self.shutdown_event.is_set():
             try:
-                await self.fetch_queue.put("fetch")
+                # 没有空闲槽位时，等待任一任务完成 | When no slot is free, wait for any task to finish
+                free_slots = self.max_concurrent_tasks - sum(slots for slots, _ in self._in_flight_tasks.values())
+                if free_slots <= 0:
+                    await asyncio.wait(self._in_flight_tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                # 长任务不能占用为短任务保留的槽位 | Long tasks may not take the slots reserved for short tasks
+                long_slots = sum(long for _, long in self._in_flight_tasks.values())
+                free_long_slots = self.max_concurrent_tasks - self.short_task_reserved_slots - long_slots
+                if free_long_slots <= 0:
+                    await self.fetch_queue.put((free_slots, self.short_task_max_duration))
+                else:
+                    await self.fetch_queue.put((min(free_slots, free_long_slots), None))
                 tasks: List[Task] = await self.task_processing_queue.get()
 
                 if tasks:
-                    await self._process_multiple_tasks(tasks)
+                    self._idle_delay = 0.1
+                    self._process_multiple_tasks(tasks)
                 else:
                     current_time = time.time()
                     if current_time - last_log_time >= log_delay:
                         self.logger.info(f"No tasks to process, waiting for new tasks...")
                         last_log_time = current_time
-                    await asyncio.sleep(self.task_status_check_interval)
+                    # 刚处理完任务时快速重新查询，持续空闲时逐渐退避 | Re-poll quickly right after activity and back off while idle
+                    await self._wait_for_new_task(self._idle_delay)
+                    self._idle_delay = min(self._idle_delay * 2, self.task_status_check_interval)
             except Exception as e:
                 self.logger.error(f"Error while pulling tasks from the database: {str(e)}")
                 self.logger.error(traceback.format_exc())
                 await asyncio.sleep(self.task_status_check_interval)
 
-    async def _fetch_multiple_tasks(self) -> List[Task]:
+    def notify_new_task(self) -> None:
+        """
+        通知任务处理器有新任务入库，可从任意线程安全调用。
+
+        Notifies the task processor that a new task has been stored, safe to call from any thread.
+
+        :return: None
+        """
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.new_task_event.set)
+
+    def enqueue_callback(self, task: Task) -> None:
+        """
+        将未经过处理器处理的任务（例如命中结果缓存的任务）加入回调队列，可从任意线程安全调用。
+
+        Adds a task that did not go through the processor (e.g. a result cache hit) to the callback queue, safe to call from any thread.
+
+        :param task: 要发送回调通知的任务实例 | Task instance to send callback notification for
+        :return: None
+        """
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.callback_queue.put_nowait, {"task": task, "result": None})
+
+    async def _wait_for_new_task(self, timeout: float) -> None:
         """
-        从数据库中按优先级获取指定数量的排队任务。
+        等待新任务通知或正在执行的任务完成，超时后仍会重新查询数据库，以便拾取其他节点写入的任务。
 
-        Fetches a specified number of queued tasks from the database based on priority.
+        Waits for a new task notification or for an in-flight task to finish; on timeout the database is polled again
+        so that tasks written by other nodes are still picked up.
 
-        :return: 按优先级排序的任务列表 | List of tasks sorted by priority
+        :param timeout: 最长等待时间（秒） | Maximum wait time (seconds)
+        :return: None
         """
-        remaining_tasks = await self.db_manager.get_queued_tasks(self.max_concurrent_tasks)
-        return remaining_tasks
+        # 正在执行的任务完成时也立即唤醒，以便释放的槽位可以认领长任务 | Also wake up when an in-flight task finishes, so the freed slot can claim long tasks
+        new_task_waiter = self.loop.create_task(self.new_task_event.wait())
+        try:
+            await asyncio.wait({new_task_waiter, *self._in_flight_tasks}, timeout=timeout,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            new_task_waiter.cancel()
+            self.new_task_event.clear()
 
-    async def _process_multiple_tasks(self, tasks: List[Task]) -> None:
+    def _process_multiple_tasks(self, tasks: List[Task]) -> None:
         """
-        并行处理给定的多个任务，将每个任务提交到线程池。
+        将给定的多个任务提交到线程池并行处理，不等待其完成。可批量推理的短音频任务会合并为一批一次前向计算。
 
-        Processes multiple tasks in parallel, submitting each to the thread pool.
+        Submits the given tasks to the thread pool for parallel processing without waiting for them to finish.
+        Short audio tasks that can be batched are merged into one batch and run in a single forward pass.
 
         :param tasks: 要处理的任务列表 | List of tasks to process
         :return: None
         """
-        loop = asyncio.get_running_loop()
-        futures = [
-            loop.run_in_executor(_executor, self._process_task_sync, task)
-            for task in tasks
-        ]
+        # 按任务类型和解码选项分组可批量处理的任务 | Group batchable tasks by task type and decode options
+        batches: dict = {}
+        single_tasks: List[Task] = []
+        for task in tasks:
+            if self._can_batch(task):
+                key = (task.task_type, json.dumps(task.decode_options, sort_keys=True))
+                batches.setdefault(key, []).append(task)
+            else:
+                single_tasks.append(task)
+        for batch in batches.values():
+            if len(batch) > 1:
+                self._track_in_flight(self._process_batch(batch), len(batch),
+                                      sum(not self._is_short_task(task) for task in batch))
+            else:
+                single_tasks.extend(batch)
+
+        for index, task in enumerate(single_tasks):
+            self._track_in_flight(self._process_single_task(task), 1, 0 if self._is_short_task(task) else 1)
+            # 当前任务开始转录后，预读下一个任务的文件到系统页缓存 | Once this task starts, prefetch the next task's file into the OS page cache
+            if index + 1 < len(single_tasks) and single_tasks[index + 1].file_path:
+                self._prefetch_executor.submit(self._warm_file_cache, single_tasks[index + 1].file_path, self.file_utils.CHUNK_SIZE)
+
+    def _track_in_flight(self, coro: Coroutine, slots: int, long_slots: int) -> None:
+        """
+        在事件循环中启动协程，并记录其占用的槽位数，完成后自动释放。
+
+        Starts a coroutine on the event loop and records the number of slots it occupies, released automatically on completion.
+
+        :param coro: 要执行的协程 | Coroutine to run
+        :param slots: 占用的槽位数 | Number of slots occupied
+        :param long_slots: 其中长音频任务占用的槽位数 | Number of those slots occupied by long audio tasks
+        :return: None
+        """
+        in_flight = self.loop.create_task(coro)
+        self._in_flight_tasks[in_flight] = (slots, long_slots)
+        in_flight.add_done_callback(lambda done: self._in_flight_tasks.pop(done, None))
+
+    async def _process_single_task(self, task: Task) -> None:
+        """
+        在线程池中处理单个任务，完成后将其加入清理和回调队列。
 
-        # 使用 gather 并设置 return_exceptions=True 以便即使某个任务失败也不会影响其他任务
-        # Use gather with return_exceptions=True to allow all tasks to complete even if some fail
-        results = await asyncio.gather(*futures, return_exceptions=True)
+        Processes a single task in the thread pool, then adds it to the cleanup and callback queues.
 
+        :param task: 要处理的任务实例 | The task instance to process
+        :return: None
+        """
+        try:
+            result = await self.loop.run_in_executor(self._executor, self._process_task_sync, task)
+        except Exception as e:
+            # 即使任务失败也继续执行清理和回调 | Still run cleanup and callback even if the task fails
+            result = e
+        await self._finish_task(task, result)
+
+    async def _process_batch(self, tasks: List[Task]) -> None:
+        """
+        在线程池中批量处理多个短音频任务，完成后将每个任务加入清理和回调队列。
+
+        Processes multiple short audio tasks as one batch in the thread pool, then adds each task to the cleanup and callback queues.
+
+        :param tasks: 要批量处理的任务列表 | List of tasks to process as a batch
+        :return: None
+        """
+        try:
+            results = await self.loop.run_in_executor(self._executor, self._process_batch_sync, tasks)
+        except Exception as e:
+            results = [e] * len(tasks)
         for task, result in zip(tasks, results):
-            # 添加清理任务到队列中 | Add cleanup task to queue
-            task_and_task = {
-                "task": task,
-                "result": result
-            }
-            await self.cleanup_queue.put(task_and_task)
-            await self.callback_queue.put(task_and_task)
-            if isinstance(result, Exception):
-                self.logger.error(
-                    f"""
-                    Error processing task:
-                    ID          : {task.id}
-                    Engine      : {task.engine_name}
-                    Priority    : {task.priority}
-                    File        : {task.file_name}
-                    Size        : {task.file_size_bytes} bytes
-                    Duration    : {task.file_duration} seconds
-                    Created At  : {task.created_at}
-                    Output URL  : {task.output_url}
-                    Error       : {str(result)}
-                    """,
-                    exc_info=result
-                )
+            await self._finish_task(task, result)
+
+    async def _finish_task(self, task: Task, result: Any) -> None:
+        """
+        将处理完成的任务加入清理和回调队列并记录日志。
+
+        Adds a processed task to the cleanup and callback queues and logs the outcome.
+
+        :param task: 已处理的任务实例 | The processed task instance
+        :param result: 任务处理结果或异常 | Task processing result or exception
+        :return: None
+        """
+        # 添加清理任务到队列中 | Add cleanup task to queue
+        task_and_task = {
+            "task": task,
+            "result": result
+        }
+        await self.cleanup_queue.put(task_and_task)
+        await self.callback_queue.put(task_and_task)
+        if isinstance(result, Exception):
+            self.logger.error(
+                """
+                Error processing task:
+                ID          : %s
+                Engine      : %s
+                Priority    : %s
+                File        : %s
+                Size        : %s bytes
+                Duration    : %s seconds
+                Created At  : %s
+                Output URL  : %s
+                Error       : %s
+                """,
+                task.id, task.engine_name, task.priority, task.file_name, task.file_size_bytes,
+                task.file_duration, task.created_at, task.output_url, result,
+                exc_info=result
+            )
+        else:
+            self.logger.info("Task %s processed successfully.", task.id)
+
+    def _is_short_task(self, task: Task) -> bool:
+        """
+        判断任务是否为短音频任务，时长未知（例如尚未下载的 URL 任务）时视为长任务。
+
+        Determines whether a task is a short audio task, tasks of unknown duration (e.g. URL tasks not yet downloaded) count as long.
+
+        :param task: 任务实例 | Task instance
+        :return: 是否为短音频任务 | Whether the task is a short audio task
+        """
+        return task.file_duration is not None and task.file_duration <= self.short_task_max_duration
+
+    def _can_batch(self, task: Task) -> bool:
+        """
+        判断任务是否可以与其他任务合并批量推理：仅适用于线程池中的 openai_whisper 引擎、
+        不超过一个 30 秒解码窗口且不需要逐词时间戳或片段裁剪的本地文件。
+
+        Determines whether a task can be merged with others for batched inference: only applies to the openai_whisper
+        engine running in the thread pool, for local files that fit in a single 30 second decoding window and need
+        neither word timestamps nor clip timestamps.
+
+        :param task: 任务实例 | Task instance
+        :return: 是否可以批量推理 | Whether the task can be batched
+        """
+        if not Settings.WhisperServiceSettings.BATCH_SHORT_AUDIO_TASKS:
+            return False
+        if self._process_executor is not None or self.model_pool.engine != "openai_whisper":
+            return False
+        if not task.file_path or not task.file_duration or task.file_duration > whisper.audio.CHUNK_LENGTH:
+            return False
+        decode_options = task.decode_options or {}
+        if decode_options.get("word_timestamps"):
+            return False
+        return decode_options.get("clip_timestamps", "0") in ("0", 0, [0], [0.0])
+
+    def _process_batch_sync(self, tasks: List[Task]) -> List[Any]:
+        """
+        在线程池中同步批量处理多个短音频任务：将所有音频的梅尔频谱堆叠后一次解码，摊薄模型权重的显存读取开销。
+        未通过质量阈值而需要温度回退的任务，以及批量推理出错时的所有任务，会回退为逐个处理。
+
+        Synchronously processes multiple short audio tasks as a batch in the thread pool: the mel spectrograms of all
+        audio files are stacked and decoded at once, amortizing the memory traffic of the model weights.
+        Tasks that fail the quality thresholds and need temperature fallback, and all tasks when batched inference
+        fails, fall back to being processed one by one.
+
+        :param tasks: 要批量处理的任务列表 | List of tasks to process as a batch
+        :return: 每个任务的处理结果 | Processing result of each task
+        """
+        results: List[Any] = [None] * len(tasks)
+        try:
+            with self._lease_model() as model:
+                task_start_time: int = time.perf_counter_ns()
+                transcribe_results = self._transcribe_short_batch(model, tasks)
+                task_processing_time = (time.perf_counter_ns() - task_start_time) / 1e9 / len(tasks)
+            for index, (task, transcribe_result) in enumerate(zip(tasks, transcribe_results)):
+                if transcribe_result is not None:
+                    results[index] = self._complete_task(task,
+                                                         transcribe_result['segments'],
+                                                         transcribe_result['language'],
+                                                         {},
+                                                         task_processing_time)
+        except Exception as e:
+            self.logger.warning("Batched inference failed, falling back to per-task processing: %s", e)
+
+        for index, task in enumerate(tasks):
+            if results[index] is None:
+                results[index] = self._process_task_sync(task)
+        return results
+
+    def _transcribe_short_batch(self, model: Any, tasks: List[Task]) -> List[Optional[dict]]:
+        """
+        使用 OpenAI Whisper 对多个不超过 30 秒的音频执行一次批量解码，返回与 transcribe 相同结构的结果。
+        需要温度回退的任务返回 None。
+
+        Runs one batched OpenAI Whisper decode over multiple audio files of at most 30 seconds, returning results in
+        the same structure as transcribe. Returns None for tasks that need temperature fallback.
+
+        :param model: OpenAI Whisper 模型实例 | OpenAI Whisper model instance
+        :param tasks: 解码选项相同的任务列表 | List of tasks sharing the same decode options
+        :return: 每个任务的转录结果，需要回退时为 None | Transcription result of each task, None when fallback is needed
+        """
+        decode_options = tasks[0].decode_options or {}
+        temperatures = decode_options.get("temperature", 0.0)
+        if not isinstance(temperatures, (list, tuple)):
+            temperatures = [temperatures]
+        compression_ratio_threshold = decode_options.get("compression_ratio_threshold", 2.4)
+        logprob_threshold = decode_options.get("logprob_threshold", -1.0)
+        no_speech_threshold = decode_options.get("no_speech_threshold", 0.6)
+
+        # 使用 PyAV 在进程内解码并填充到 30 秒窗口，在模型所在设备上批量计算梅尔频谱
+        # Decode in-process with PyAV and pad to the 30 second window, then compute the mel spectrograms as a batch on the model device
+        # GPU 上直接写入锁页内存，non_blocking 拷贝才会真正异步 | On GPU write straight into pinned memory so the non_blocking copy is truly asynchronous
+        audio = torch.empty((len(tasks), whisper.audio.N_SAMPLES), dtype=torch.float32,
+                            pin_memory=model.device.type == "cuda")
+        for row, task in enumerate(tasks):
+            audio[row] = torch.from_numpy(whisper.pad_or_trim(decode_audio(task.file_path)))
+        mel = self._batch_log_mel_spectrogram(audio.to(model.device, non_blocking=True), model.dims.n_mels)
+        options = whisper.DecodingOptions(
+            task=tasks[0].task_type,
+            language=decode_options.get("language"),
+            temperature=temperatures[0],
+            prompt=decode_options.get("initial_prompt") or None,
+            fp16=model.device.type == "cuda"
+        )
+        with torch.inference_mode():
+            decoding_results = model.decode(mel, options)
+
+        transcribe_results: List[Optional[dict]] = []
+        for task, decoding_result in zip(tasks, decoding_results):
+            # 与 transcribe 相同的静音判断：跳过无语音的窗口 | Same silence check as transcribe: skip windows without speech
+            if (no_speech_threshold is not None and decoding_result.no_speech_prob > no_speech_threshold
+                    and logprob_threshold is not None and decoding_result.avg_logprob < logprob_threshold):
+                transcribe_results.append({"segments": [], "language": decoding_result.language})
+                continue
+            needs_fallback = (
+                (compression_ratio_threshold is not None and decoding_result.compression_ratio > compression_ratio_threshold)
+                or (logprob_threshold is not None and decoding_result.avg_logprob < logprob_threshold)
+            )
+            if needs_fallback and len(temperatures) > 1:
+                transcribe_results.append(None)
+                continue
+            tokenizer = get_tokenizer(model.is_multilingual,
+                                      num_languages=model.num_languages,
+                                      language=decoding_result.language,
+                                      task=task.task_type)
+            transcribe_results.append({
+                "segments": self._split_timestamped_tokens(tokenizer, decoding_result, temperatures[0], task.file_duration),
+                "language": decoding_result.language
+            })
+        return transcribe_results
+
+    @staticmethod
+    def _batch_log_mel_spectrogram(audio: torch.Tensor, n_mels: int) -> torch.Tensor:
+        """
+        对一批音频一次性计算 OpenAI Whisper 的对数梅尔频谱，与逐个调用 whisper.log_mel_spectrogram 的结果一致，
+        但 STFT 和梅尔滤波在音频所在设备上批量执行，动态范围按每条音频分别截断。
+
+        Computes OpenAI Whisper log-mel spectrograms for a batch of audio at once, matching per-item calls to
+        whisper.log_mel_spectrogram, but running the STFT and mel filtering as a batch on the audio's device,
+        with the dynamic range clamped per item.
+
+        :param audio: 形状为 (batch, samples) 的 16kHz 音频张量 | 16kHz audio tensor of shape (batch, samples)
+        :param n_mels: 梅尔频带数 | Number of mel bands
+        :return: 形状为 (batch, n_mels, frames) 的对数梅尔频谱 | Log-mel spectrograms of shape (batch, n_mels, frames)
+        """
+        window = torch.hann_window(whisper.audio.N_FFT, device=audio.device)
+        stft = torch.stft(audio, whisper.audio.N_FFT, whisper.audio.HOP_LENGTH, window=window, return_complex=True)
+        magnitudes = stft[..., :-1].abs() ** 2
+        mel_spec = whisper.audio.mel_filters(audio.device, n_mels) @ magnitudes
+        log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+        log_spec = torch.maximum(log_spec, log_spec.amax(dim=(-2, -1), keepdim=True) - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+    @staticmethod
+    def _batched_clip_timestamps(clip_timestamps: Union[str, float, List[float], None],
+                                 duration: Optional[float]) -> Optional[List[dict]]:
+        """
+        将请求中的裁剪时间戳（逗号分隔的字符串或秒数列表，成对表示起止时间）转换为批量推理管线所需的片段字典列表。
+        默认值 "0" 表示处理整个音频，转换为 None；末尾未配对的起始时间截止到音频结束。
+
+        Converts the clip timestamps of a request (a comma-separated string or a list of seconds, taken as start/end pairs)
+        into the list of segment dictionaries expected by the batched inference pipeline.
+        The default "0" means the whole audio and becomes None; an unpaired trailing start runs until the end of the audio.
+
+        :param clip_timestamps: 请求中的裁剪时间戳 | Clip timestamps of the request
+        :param duration: 音频时长（秒），未知时为 None | Audio duration (seconds), None if unknown
+        :return: 片段字典列表，处理整个音频时返回 None | List of segment dictionaries, None for the whole audio
+        """
+        if clip_timestamps is None:
+            return None
+        if isinstance(clip_timestamps, str):
+            clip_timestamps = [float(value) for value in clip_timestamps.split(",") if value.strip()]
+        elif isinstance(clip_timestamps, (int, float)):
+            clip_timestamps = [float(clip_timestamps)]
+        if not clip_timestamps or list(clip_timestamps) == [0]:
+            return None
+        if len(clip_timestamps) % 2:
+            # 批量推理只转录每个片段的前 30 秒，时长未知时以 30 秒作为结束 | Batched inference only transcribes the first 30 seconds of each clip, use 30 seconds when the duration is unknown
+            start = clip_timestamps[-1]
+            clip_timestamps = [*clip_timestamps, duration if duration is not None else start + whisper.audio.CHUNK_LENGTH]
+        return [{"start": start, "end": end} for start, end in zip(clip_timestamps[::2], clip_timestamps[1::2])]
+
+    @staticmethod
+    def _split_timestamped_tokens(tokenizer: Any, decoding_result: Any, temperature: float, duration: float) -> List[dict]:
+        """
+        按时间戳标记将单个解码窗口的输出切分为片段，片段结构与 OpenAI Whisper transcribe 的输出一致。
+
+        Splits the output of a single decoding window into segments at timestamp tokens, using the same segment
+        structure as OpenAI Whisper transcribe.
+
+        :param tokenizer: OpenAI Whisper 分词器 | OpenAI Whisper tokenizer
+        :param decoding_result: 单个音频的解码结果 | Decoding result of a single audio
+        :param temperature: 解码温度 | Decoding temperature
+        :param duration: 音频时长（秒） | Audio duration (seconds)
+        :return: 片段字典列表 | List of segment dictionaries
+        """
+        segments: List[dict] = []
+        start: Optional[float] = None
+        text_tokens: List[int] = []
+
+        def add_segment(end: float) -> None:
+            segments.append({
+                "id": len(segments),
+                "seek": 0,
+                "start": start or 0.0,
+                "end": end,
+                "text": tokenizer.decode(text_tokens),
+                "tokens": list(text_tokens),
+                "temperature": temperature,
+                "avg_logprob": decoding_result.avg_logprob,
+                "compression_ratio": decoding_result.compression_ratio,
+                "no_speech_prob": decoding_result.no_speech_prob
+            })
+
+        for token in decoding_result.tokens:
+            if token < tokenizer.timestamp_begin:
+                text_tokens.append(token)
+                continue
+            timestamp = (token - tokenizer.timestamp_begin) * 0.02
+            if start is None:
+                start = timestamp
             else:
-                self.logger.info(f"Task {task.id} processed successfully.")
+                if text_tokens:
+                    add_segment(timestamp)
+                text_tokens = []
+                start = None
+        if text_tokens:
+            add_segment(duration)
+        return segments
 
     def _process_task_sync(self, task: Task) -> dict:
         """
@@ -360,19 +850,22 @@ class TaskProcessor:
         :return: dict: 任务处理结果 | dict: Task processing result
         """
         try:
+            # 使用惰性格式化，日志级别不输出时不产生格式化开销 | Use lazy formatting so nothing is formatted when the level is disabled
             self.logger.info(
-                f"""
-                Processing queued task:
-                ID          : {task.id}
-                Engine      : {task.engine_name}
-                Type        : {task.task_type}
-                Priority    : {task.priority}
-                File        : {task.file_name}
-                Size        : {task.file_size_bytes} bytes
-                Duration    : {task.file_duration} seconds
-                Created At  : {task.created_at}
-                Output URL  : {task.output_url}
                 """
+                Processing queued task:
+                ID          : %s
+                Engine      : %s
+                Type        : %s
+                Priority    : %s
+                File        : %s
+                Size        : %s bytes
+                Duration    : %s seconds
+                Created At  : %s
+                Output URL  : %s
+                """,
+                task.id, task.engine_name, task.task_type, task.priority, task.file_name,
+                task.file_size_bytes, task.file_duration, task.created_at, task.output_url
             )
 
             # 检查任务是否需要从 URL 下载文件 | Check if the task requires downloading the file from a URL
@@ -380,14 +873,14 @@ class TaskProcessor:
                 self.logger.info("Detected task with file URL, start downloading file from URL...")
 
                 # 异步下载文件并获取相关信息 | Asynchronously download the file and get relevant information
-                task.file_path = asyncio.run(self.file_utils.download_file_from_url(task.file_url))
+                task.file_path = self._run_coroutine(self.file_utils.download_file_from_url(task.file_url))
 
                 # 检查文件路径是否有效 | Check if the file path is valid
                 if not task.file_path:
                     raise ValueError("Failed to download file: file path is missing")
 
                 # 获取文件时长和大小 | Get file duration and size
-                task.file_duration = asyncio.run(self.file_utils.get_audio_duration(task.file_path))
+                task.file_duration = self._run_coroutine(self.file_utils.get_audio_duration(task.file_path))
                 task.file_size_bytes = os.path.getsize(task.file_path)
 
                 # 检查下载后的文件属性是否齐全 | Check if the downloaded file attributes are complete
@@ -395,39 +888,69 @@ class TaskProcessor:
                     raise ValueError("Error: Incomplete file download or invalid file attributes")
 
                 # 日志记录 | Log the download
-                self.logger.info(f"""
+                self.logger.info("""
                     Downloaded task file from URL:
-                    ID          : {task.id}
-                    File Path   : {task.file_path}
-                    File Size   : {task.file_size_bytes} bytes
-                    Duration    : {task.file_duration} seconds
-                    URL         : {task.file_url}
-                    """)
-
-            # 获取模型实例 | Acquire a model instance
-            model = asyncio.run(self.model_pool.get_model())
-            # 如果模型是线程安全的，可以直接使用 acquire_model 方法 | If the model is thread-safe, you can use the acquire_model method directly
-            # model = asyncio.run(self.model_pool.acquire_model())
-
-            try:
+                    ID          : %s
+                    File Path   : %s
+                    File Size   : %s bytes
+                    Duration    : %s seconds
+                    URL         : %s
+                    """, task.id, task.file_path, task.file_size_bytes, task.file_duration, task.file_url)
+
+            # 租用模型实例，退出时总会归还到池中，使用进程池时模型位于工作进程中
+            # Lease a model instance that is always returned to the pool on exit, the model lives in the worker process when using the process pool
+            with self._lease_model() if self._process_executor is None else nullcontext() as model:
                 # 记录任务开始时间 | Record task start time
-                task_start_time: datetime.datetime = datetime.datetime.now()
+                # 使用单调时钟计时，不受系统时间调整影响 | Use a monotonic clock, unaffected by system clock adjustments
+                task_start_time: int = time.perf_counter_ns()
 
                 # 执行转录任务 | Perform transcription task
-                if self.model_pool.engine == "openai_whisper":
-                    transcribe_result = model.transcribe(task.file_path,
-                                                         **task.decode_options or {},
-                                                         task=task.task_type)
+                if self._process_executor is not None:
+                    transcribe_result = self._process_executor.submit(
+                        transcribe_in_worker,
+                        task.file_path,
+                        task.decode_options or {},
+                        task.task_type
+                    ).result()
+                    segments = transcribe_result['segments']
+                    language = transcribe_result.get('language')
+                    info = {}
+
+                elif self.model_pool.engine == "openai_whisper":
+                    # 使用 PyAV 在进程内解码为 16kHz PCM，避免 OpenAI Whisper 为每个文件启动 ffmpeg 子进程
+                    # Decode to 16kHz PCM in-process with PyAV, avoiding the ffmpeg subprocess OpenAI Whisper spawns per file
+                    # 推理模式下跳过自动求导的版本计数和视图追踪 | Inference mode skips autograd version counting and view tracking
+                    with torch.inference_mode():
+                        # CPU 不支持 FP16，显式关闭以免每次转录都回退并告警 | FP16 is unsupported on CPU, disable it explicitly instead of falling back with a warning on every call
+                        transcribe_result = model.transcribe(decode_audio(task.file_path),
+                                                             **{"fp16": model.device.type == "cuda",
+                                                                **(task.decode_options or {})},
+                                                             task=task.task_type)
                     segments = transcribe_result['segments']
                     language = transcribe_result.get('language')
                     # OpenAI Whisper不返回info，保持空字典 | OpenAI Whisper does not return info, keep an empty dictionary
                     info = {}
 
                 elif self.model_pool.engine == "faster_whisper":
-                    segments, info = model.transcribe(task.file_path,
-                                                      **task.decode_options or {},
-                                                      task=task.task_type)
-                    segments = [self.segments_to_dict(segment) for segment in segments]
+                    # 启用批量推理时，将音频切片按批次送入模型 | When batched inference is enabled, feed audio chunks to the model in batches
+                    # 请求未指定束搜索宽度时使用服务端默认值 | Use the server default beam size when the request does not specify one
+                    decode_options = {"beam_size": self.beam_size, **(task.decode_options or {})}
+                    if self.batch_size > 0:
+                        # 批量推理管线要求片段字典形式的裁剪时间戳 | The batched pipeline expects clip timestamps as segment dictionaries
+                        decode_options["clip_timestamps"] = self._batched_clip_timestamps(
+                            decode_options.get("clip_timestamps"), task.file_duration)
+                        pipeline = self._batched_pipelines.get(model)
+                        if pipeline is None:
+                            pipeline = self._batched_pipelines[model] = BatchedInferencePipeline(model=model)
+                        segments, info = pipeline.transcribe(task.file_path,
+                                                             **decode_options,
+                                                             task=task.task_type,
+                                                             batch_size=self.batch_size)
+                    else:
+                        segments, info = model.transcribe(task.file_path,
+                                                          **decode_options,
+                                                          task=task.task_type)
+                    segments = self._collect_segments(task.id, segments)
                     language = info.language
                     # 转换info为字典格式 | Convert info to dictionary format
                     info = self.segments_to_dict(info)
@@ -435,48 +958,11 @@ class TaskProcessor:
                 else:
                     raise ValueError(f"Trying to process task with unsupported engine: {self.model_pool.engine}")
 
-                # 通用的结果结构 | Common result structure
-                result = {
-                    "text": " ".join([seg['text'] for seg in segments]).strip(),
-                    "segments": segments,
-                    "info": info
-                }
-
                 # 记录任务结束时间 | Record task end time
-                task_end_time: datetime.datetime = datetime.datetime.now()
-                task_processing_time = (task_end_time - task_start_time).total_seconds()
-
-                self.logger.info(
-                    f"""
-                    Task processed successfully:
-                    ID          : {task.id}
-                    Engine      : {task.engine_name}
-                    Priority    : {task.priority}
-                    Type        : {task.task_type}
-                    File        : {task.file_name}
-                    Size        : {task.file_size_bytes} bytes
-                    Duration    : {task.file_duration} seconds
-                    Created At  : {task.created_at}
-                    Output URL  : {task.output_url}
-                    Language    : {language}
-                    Processing Time: {task_processing_time} seconds
-                    """
-                )
+                task_processing_time = (time.perf_counter_ns() - task_start_time) / 1e9
 
-                # 更新任务状态和结果 | Update task status and result
-                task_update = {
-                    "status": TaskStatus.completed,
-                    "file_path": task.file_path,
-                    "file_size_bytes": task.file_size_bytes,
-                    "file_duration": task.file_duration,
-                    "language": language,
-                    "result": result,
-                    "task_processing_time": task_processing_time
-                }
-                self.update_queue.put_nowait((task.id, task_update))
-            finally:
-                # 将模型实例归还到池中 | Return the model instance to the pool
-                asyncio.run(self.model_pool.return_model(model))
+            # 模型已归还，保存结果不再占用模型实例 | The model is already returned, saving the result no longer holds a model instance
+            task_update = self._complete_task(task, segments, language, info, task_processing_time)
 
             # 返回字典格式的结果 | Return the result in dictionary format
             return task_update
@@ -486,27 +972,175 @@ class TaskProcessor:
                 "status": TaskStatus.failed,
                 "error_message": str(e)
             }
-            self.update_queue.put_nowait((task.id, task_update))
+            self.loop.call_soon_threadsafe(self.update_queue.put_nowait, (task.id, task_update))
             self.logger.error(
-                f"""
-                Error processing task: 
-                ID          : {task.id}
-                Engine      : {task.engine_name}
-                Priority    : {task.priority}
-                Type        : {task.task_type}
-                File        : {task.file_name}
-                Size        : {task.file_size_bytes} bytes
-                Duration    : {task.file_duration} seconds
-                Created At  : {task.created_at}
-                Output URL  : {task.output_url}
-                Error       : {str(e)}
                 """
+                Error processing task:
+                ID          : %s
+                Engine      : %s
+                Priority    : %s
+                Type        : %s
+                File        : %s
+                Size        : %s bytes
+                Duration    : %s seconds
+                Created At  : %s
+                Output URL  : %s
+                Error       : %s
+                """,
+                task.id, task.engine_name, task.priority, task.task_type, task.file_name,
+                task.file_size_bytes, task.file_duration, task.created_at, task.output_url, e
             )
             self.logger.error(traceback.format_exc())
 
             # 返回字典格式的结果 | Return the result in dictionary format
             return task_update
 
+    def _complete_task(self, task: Task, segments: List[dict], language: Optional[str], info: dict,
+                       task_processing_time: float) -> dict:
+        """
+        组装转录结果，保存结果并将任务标记为已完成。
+
+        Assembles the transcription result, stores it and marks the task as completed.
+
+        :param task: 任务实例 | Task instance
+        :param segments: 片段字典列表 | List of segment dictionaries
+        :param language: 检测到的语言 | Detected language
+        :param info: 转录信息 | Transcription info
+        :param task_processing_time: 处理任务花费的时间（秒） | Time spent processing the task (seconds)
+        :return: 任务更新字典 | Task update dictionary
+        """
+        # 通用的结果结构 | Common result structure
+        result = {
+            "text": " ".join([seg['text'] for seg in segments]).strip(),
+            "segments": segments,
+            "info": info
+        }
+
+        self.logger.info(
+            """
+            Task processed successfully:
+            ID          : %s
+            Engine      : %s
+            Priority    : %s
+            Type        : %s
+            File        : %s
+            Size        : %s bytes
+            Duration    : %s seconds
+            Created At  : %s
+            Output URL  : %s
+            Language    : %s
+            Processing Time: %s seconds
+            """,
+            task.id, task.engine_name, task.priority, task.task_type, task.file_name, task.file_size_bytes,
+            task.file_duration, task.created_at, task.output_url, language, task_processing_time
+        )
+
+        # 更新任务状态和结果 | Update task status and result
+        task_update = {
+            "status": TaskStatus.completed,
+            "file_path": task.file_path,
+            "file_size_bytes": task.file_size_bytes,
+            "file_duration": task.file_duration,
+            "language": language,
+            "result": result,
+            "task_processing_time": task_processing_time
+        }
+        # 将结果保存为文件，数据库中仅保留文件路径 | Store the result in a file and keep only its path in the database
+        if Settings.FileSettings.store_results_in_files:
+            task_update["result"] = None
+            task_update["result_path"] = save_result_file(task.id, result)
+        self.loop.call_soon_threadsafe(self.update_queue.put_nowait, (task.id, task_update))
+        return task_update
+
+    def _collect_segments(self, task_id: int, segments: Iterable) -> List[dict]:
+        """
+        逐个消费 Faster Whisper 的片段生成器，转换为字典并分批写入数据库，使部分结果在转录过程中即可查询。
+        任务完成并保存完整结果时，这些片段会被删除。
+
+        Consumes the Faster Whisper segment generator one segment at a time, converting them to dictionaries and writing them
+        to the database in batches so that partial results are queryable while transcription is still running.
+        These segments are deleted once the task completes and its full result is stored.
+
+        :param task_id: 任务ID | Task ID
+        :param segments: 片段生成器 | Segment generator
+        :return: 所有片段的字典列表 | List of all segment dictionaries
+        """
+        # 先清除任务上一次处理时保存的片段，避免重复 | Clear the segments saved by a previous run of the task first to avoid duplicates
+        self._run_coroutine(self.db_manager.delete_task_segments(task_id))
+        collected: List[dict] = []
+        pending: List[dict] = []
+        writes: List[Future] = []
+        for segment in segments:
+            segment = self.segments_to_dict(segment)
+            collected.append(segment)
+            pending.append(segment)
+            if len(pending) >= self.segment_flush_size:
+                # 解码过程中不等待写入完成，避免阻塞解码 | Do not wait for the write during decoding, so decoding is not blocked
+                writes.append(asyncio.run_coroutine_threadsafe(self.db_manager.add_task_segments(task_id, pending),
+                                                               self.loop))
+                pending = []
+        if pending:
+            writes.append(asyncio.run_coroutine_threadsafe(self.db_manager.add_task_segments(task_id, pending),
+                                                           self.loop))
+        # 在任务标记为完成前等待所有片段写入结束，写入失败时记录日志 | Wait for all segment writes before the task is marked as completed, logging any failure
+        for write in writes:
+            try:
+                write.result()
+            except Exception as e:
+                self.logger.error(f"Failed to save segments for task ID {task_id}: {e}")
+        return collected
+
+    @contextmanager
+    def _lease_model(self) -> Iterator[Any]:
+        """
+        在工作线程中从模型池租用一个模型实例，无论是否发生异常，退出时都会将其归还到池中。
+
+        Leases a model instance from the model pool in a worker thread and returns it to the pool on exit,
+        whether or not an exception was raised.
+
+        :return: 模型实例 | Model instance
+        """
+        model = self._run_coroutine(self.model_pool.get_model())
+        try:
+            yield model
+        finally:
+            self._run_coroutine(self.model_pool.return_model(model))
+
+    def _run_coroutine(self, coro: Coroutine) -> Any:
+        """
+        在工作线程中将协程提交到处理器的事件循环并等待结果，复用事件循环及其连接池，避免每次调用 asyncio.run 创建新的事件循环。
+
+        Submits a coroutine from a worker thread to the processor's event loop and waits for the result,
+        reusing the loop and its connection pools instead of creating a new event loop with asyncio.run on every call.
+
+        :param coro: 要执行的协程 | Coroutine to run
+        :return: 协程的返回值 | Return value of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    @staticmethod
+    def _warm_file_cache(file_path: str, chunk_size: int = 1024 * 1024) -> None:
+        """
+        将文件预读到操作系统页缓存中，使后续的模型读取命中缓存。
+
+        Prefetch a file into the OS page cache so that subsequent model reads hit warm pages.
+
+        :param file_path: 要预读的文件路径 | Path of the file to prefetch
+        :param chunk_size: 不支持 posix_fadvise 时的分块读取大小 | Chunk size for reading when posix_fadvise is unavailable
+        :return: None
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if hasattr(os, "posix_fadvise"):
+                    # 交由内核异步预读，不占用用户态 CPU | Let the kernel read ahead asynchronously without user-space CPU
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                else:
+                    while f.read(chunk_size):
+                        pass
+        except OSError:
+            # 预读失败不影响任务处理 | Prefetch failures must not affect task processing
+            pass
+
     @staticmethod
     def segments_to_dict(obj: Any) -> Any:
         """
@@ -0,0 +1,87 @@
+# ==============================================================================
+# Copyright (C) 2024 Evil0ctal
+#
+# This file is part of the Whisper-Speech-to-Text-API project.
+# Github: https://github.com/Evil0ctal/Whisper-Speech-to-Text-API
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#                                     ,
+#              ,-.       _,---._ __  / \
+#             /  )    .-'       `./ /   \
+#            (  (   ,'            `/    /|
+#             \  `-"             \'\   / |
+#              `.              ,  \ \ /  |
+#               /`.          ,'-`----Y   |
+#              (            ;        |   '
+#              |  ,-.    ,-'         |  /
+#              |  | (   |  Evil0ctal | /
+#              )  |  \  `.___________|/    Whisper API Out of the Box (Where is my ⭐?)
+#              `--'   `--'
+# ==============================================================================
+
+
+from typing import Optional
+
+# 当前工作进程中加载的模型实例 | Model instance loaded in the current worker process
+_worker_model = None
+
+
+def initialize_worker(model_name: str, download_root: Optional[str], in_memory: bool) -> None:
+    """
+    进程池初始化函数，在每个工作进程中加载独立的 OpenAI Whisper 模型（模型实例无法被 pickle，不能从主进程传递）。
+
+    Process pool initializer that loads a dedicated OpenAI Whisper model in each worker process
+    (model instances are not picklable and cannot be passed from the parent process).
+
+    :param model_name: 模型名称 | Model name
+    :param download_root: 模型下载根目录 | Model download root directory
+    :param in_memory: 是否在内存中加载模型 | Whether to load the model in memory
+    :return: None
+    """
+    global _worker_model
+    from app.model_pool.model_loader import load_openai_whisper_model
+    _worker_model = load_openai_whisper_model(model_name, "cpu", download_root, in_memory)
+
+
+def ping_worker() -> None:
+    """
+    空操作，用于提前启动工作进程并加载模型。
+
+    No-op used to spawn the worker processes and load their models ahead of the first task.
+
+    :return: None
+    """
+    return None
+
+
+def transcribe_in_worker(file_path: str, decode_options: dict, task_type: str) -> dict:
+    """
+    在工作进程中执行转录，仅接收和返回可 pickle 的基础类型。
+
+    Runs a transcription inside the worker process, taking and returning picklable primitives only.
+
+    :param file_path: 音频文件路径 | Audio file path
+    :param decode_options: Whisper 解码选项 | Whisper decode options
+    :param task_type: 任务类型，'transcribe' 或 'translate' | Task type, 'transcribe' or 'translate'
+    :return: OpenAI Whisper 的转录结果字典 | OpenAI Whisper transcription result dictionary
+    """
+    if _worker_model is None:
+        raise RuntimeError("Transcription worker model is not initialized.")
+    # 使用 PyAV 在进程内解码，避免额外启动 ffmpeg 子进程 | Decode in-process with PyAV instead of spawning an ffmpeg subprocess
+    import torch
+    from faster_whisper import decode_audio
+    # 推理模式下跳过自动求导的版本计数和视图追踪 | Inference mode skips autograd version counting and view tracking
+    with torch.inference_mode():
+        return _worker_model.transcribe(decode_audio(file_path),
+                                        **{"fp16": _worker_model.device.type == "cuda", **decode_options},
+                                        task=task_type)
@@ -58,8 +58,9 @@ class CallbackService:
                                          proxy_settings: Optional[Dict[str, str]] = None,
                                          method: str = "POST",
                                          headers: Optional[dict] = None,
-                                         request_timeout: int = 10
-                                         ) -> None:
+                                         request_timeout: int = 10,
+                                         persist_status: bool = True
+                                         ) -> Optional[dict]:
         """
         发送任务处理结果的回调通知。
 
@@ -71,7 +72,8 @@ class CallbackService:
         :param method: 可选的请求方法 | Optional request method
         :param headers: 可选的请求头 | Optional request headers
         :param request_timeout: 请求超时时间 | Request timeout
-        :return: None
+        :param persist_status: 是否立即写入回调状态，为 False 时由调用方合并到批量更新中 | Whether to write the callback status immediately; when False the caller merges it into a bulk update
+        :return: 回调状态字段，未发送回调时为 None | Callback status fields, None when no callback was sent
         """
         callback_url = task.callback_url
         headers = headers or self.default_headers
@@ -95,11 +97,14 @@ class CallbackService:
 
                 # 更新任务的回调状态码和消息 | Update the callback status code and message of the task
                 logger.info(f"Callback response status code for task {task.id}: {response.status_code}")
-                await db_manager.update_task_callback_status(
-                    task_id=task.id,
-                    callback_status_code=response.status_code,
-                    callback_message=response.text,
-                    callback_time=datetime.datetime.now()
-                )
+                callback_status = {
+                    "callback_status_code": response.status_code,
+                    "callback_message": response.text or None,
+                    "callback_time": datetime.datetime.now()
+                }
+                if persist_status:
+                    await db_manager.update_task_callback_status(task_id=task.id, **callback_status)
+                return callback_status
         else:
             logger.info(f"No callback URL provided for task {task.id}, skipping callback notification.")
+        return None
@@ -29,27 +29,24 @@
 #              `--'   `--'
 # ==============================================================================
 
+import asyncio
+import bisect
 import os
 import traceback
 import uuid
-from typing import Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Iterator
 from fastapi import Request, UploadFile, BackgroundTasks
 from fastapi.responses import FileResponse
-from moviepy.video.io.VideoFileClip import VideoFileClip
-from pydub import AudioSegment
 
 from app.model_pool.AsyncModelPool import AsyncModelPool
 from app.database.DatabaseManager import DatabaseManager
-from app.database.models.TaskModels import Task
+from app.database.models.TaskModels import Task, TaskStatus
 from app.processors.task_processor import TaskProcessor
+from app.utils.ffmpeg_utils import extract_audio
 from app.utils.file_utils import FileUtils
 from app.utils.logging_utils import configure_logging
 from config.settings import Settings
 
-# 初始化静态线程池，所有实例共享 | Initialize static thread pool, shared by all instances
-_executor = ThreadPoolExecutor()
-
 
 class WhisperService:
     """
@@ -74,6 +71,12 @@ class WhisperService:
         # 数据库管理器 | Database manager
         self.db_manager = db_manager
 
+        # 模型池最大实例数 | Maximum model pool size
+        self._pool_maxsize = self.model_pool.pool.maxsize
+
+        # 是否自动删除临时文件 | Whether to automatically delete temporary files
+        self._auto_delete = Settings.FileSettings.auto_delete
+
         # 最大并发任务数 | Maximum concurrent tasks
         self.max_concurrent_tasks = self.get_optimal_max_concurrent_tasks(max_concurrent_tasks)
 
@@ -82,7 +85,7 @@ class WhisperService:
 
         # 初始化 FileUtils 实例 | Initialize FileUtils instance
         self.file_utils = FileUtils(
-            auto_delete=Settings.FileSettings.auto_delete,
+            auto_delete=self._auto_delete,
             limit_file_size=Settings.FileSettings.limit_file_size,
             max_file_size=Settings.FileSettings.max_file_size,
             temp_dir=Settings.FileSettings.temp_files_dir
@@ -128,7 +131,7 @@ class WhisperService:
             self.logger.warning("Invalid `max_concurrent_tasks` provided. Setting to 1 to avoid issues.")
             max_concurrent_tasks = 1
 
-        pool_size = self.model_pool.pool.maxsize
+        pool_size = self._pool_maxsize
         if max_concurrent_tasks > pool_size:
             self.logger.warning(
                 f"""
@@ -159,7 +162,7 @@ class WhisperService:
         :param background_tasks: FastAPI 后台任务对象 | FastAPI background tasks object
         :return: 提取的音频 FastAPI 文件响应对象 | Extracted audio FastAPI file response object
         """
-        self.logger.debug(f"Starting audio extraction from video file: {file.filename}")
+        self.logger.debug("Starting audio extraction from video file: %s", file.filename)
 
         if not file.content_type.startswith("video/"):
             error_message = f"Invalid upload file type for audio extraction: {file.content_type}"
@@ -172,55 +175,45 @@ class WhisperService:
         temp_files_to_delete = [temp_video_path]
 
         try:
-            video_clip = VideoFileClip(temp_video_path)
-
-            temp_audio_file_name = f"{uuid.uuid4().hex}.{output_format}"
-            temp_audio_path = os.path.join(self.file_utils.TEMP_DIR, temp_audio_file_name)
-            wav_temp_file_name = f"{uuid.uuid4().hex}.wav"
-            wav_temp_path = os.path.join(self.file_utils.TEMP_DIR, wav_temp_file_name)
-            temp_files_to_delete.append(wav_temp_path)
-
-            self.logger.info(f"Extracting audio to WAV file: {wav_temp_path}")
-            video_clip.audio.write_audiofile(wav_temp_path, fps=sample_rate, nbytes=bit_depth)
-            self.logger.info(f"Audio extracted to WAV file: {wav_temp_path}")
-
-            video_clip.close()
-
-            if output_format == "wav":
-                temp_audio_path = wav_temp_path
-                self.logger.info("Output format is WAV; using extracted WAV file directly.")
-            elif output_format == "mp3":
-                self.logger.info(f"Converting WAV to MP3: {temp_audio_path}")
-                audio = AudioSegment.from_wav(wav_temp_path)
-                audio.export(temp_audio_path, format="mp3")
-                self.logger.debug(f"Audio converted to MP3: {temp_audio_path}")
-                temp_files_to_delete.append(temp_audio_path)
-            else:
+            if output_format not in ("wav", "mp3"):
                 error_message = f"Unsupported audio output format: {output_format}"
                 self.logger.error(error_message)
                 raise ValueError(error_message)
 
+            temp_audio_file_name = f"{uuid.uuid4().hex}.{output_format}"
+            temp_audio_path = os.path.join(self.file_utils.TEMP_DIR, temp_audio_file_name)
+            temp_files_to_delete.append(temp_audio_path)
+
+            # 使用单个 ffmpeg 进程直接从视频解码并编码为目标格式，无需中间 WAV 文件
+            # Decode the video and encode the target format in a single ffmpeg process, without an intermediate WAV file
+            self.logger.info(f"Extracting audio to {output_format.upper()} file: {temp_audio_path}")
+            await extract_audio(temp_video_path, temp_audio_path, sample_rate, bit_depth, output_format)
+            self.logger.info(f"Audio extracted to {output_format.upper()} file: {temp_audio_path}")
+
             # 将文件删除任务添加到后台任务中确保文件在返回响应后被删除
             # Add file deletion tasks to background tasks to ensure files are deleted after response is returned
-            if Settings.FileSettings.auto_delete and temp_files_to_delete:
+            if self._auto_delete and temp_files_to_delete:
                 for temp_file in temp_files_to_delete:
                     background_tasks.add_task(self.file_utils.delete_file, temp_file)
-                    self.logger.debug(f"Added file to delete in background task: {temp_file}")
+                    self.logger.debug("Added file to delete in background task: %s", temp_file)
 
             # 返回提取的音频文件 | Return extracted audio file
             self.logger.info(f"Returning extracted audio file: {temp_audio_path}")
-            return FileResponse(
+            response = FileResponse(
                 temp_audio_path,
                 media_type=f"audio/{output_format}",
                 filename=f"extracted_audio.{output_format}",
             )
+            # 以上传块大小发送文件，减少默认 64KB 块带来的线程切换和发送次数
+            # Send the file in upload-sized chunks, cutting the thread hops and sends of the default 64KB chunks
+            response.chunk_size = self.file_utils.CHUNK_SIZE
+            return response
         except Exception as e:
             self.logger.error(f"Audio extraction failed: {str(e)}")
             self.logger.error(traceback.format_exc())
-        finally:
-            if 'video_clip' in locals():
-                video_clip.close()
-                self.logger.info("Video clip closed.")
+            # 提取失败时不会返回响应，立即清理已创建的临时文件 | No response is returned on failure, clean up the temporary files right away
+            if self._auto_delete:
+                await self.file_utils.delete_files_in_batch(temp_files_to_delete)
 
     async def create_whisper_task(
             self,
@@ -253,15 +246,43 @@ class WhisperService:
 
         # 如果file是UploadFile对象或者bytes对象，那么就保存到临时文件夹，然后返回临时文件路径
         # If file is an UploadFile object or bytes object, save it to the temporary folder and return the temporary file path
+        cached_task = None
         if file_upload:
-            temp_file_path = await self.file_utils.save_uploaded_file(file=file_upload, file_name=file_name)
-            self.logger.debug(f"Saved uploaded file to temporary path: {temp_file_path}")
-            duration = await self.file_utils.get_audio_duration(temp_file_path)
-            file_size_bytes = os.path.getsize(temp_file_path)
+            # 在写入文件的同一次遍历中计算内容哈希和文件大小 | Compute the content hash and file size in the same pass that writes the file
+            temp_file_path, content_hash, file_size_bytes = await self.file_utils.save_uploaded_file_with_hash(
+                file=file_upload,
+                file_name=file_name
+            )
+            self.logger.debug("Saved uploaded file to temporary path: %s", temp_file_path)
+            # 音频时长探测与缓存查询互不依赖，并发执行 | Duration probing and the cache lookup are independent, run them concurrently
+            if Settings.WhisperServiceSettings.ENABLE_RESULT_CACHE:
+                # 查找相同文件和参数的已完成、排队中或处理中的任务 | Look up a completed, queued or processing task with the same file and parameters
+                duration, cached_task = await asyncio.gather(
+                    self.file_utils.get_audio_duration(temp_file_path),
+                    self.db_manager.get_cached_result_task(
+                        content_hash=content_hash,
+                        task_type=task_type,
+                        engine_name=self.model_pool.engine,
+                        decode_options=decode_options,
+                        include_in_flight=Settings.WhisperServiceSettings.DEDUPLICATE_IN_FLIGHT_TASKS
+                    )
+                )
+                if cached_task and cached_task.status != TaskStatus.completed:
+                    # 重复提交且回调地址相同时直接返回尚未完成的原任务，避免重复转录 | For a resubmission with the same callback URL, return the unfinished original task to avoid transcribing twice
+                    if cached_task.callback_url == callback_url:
+                        self.logger.info("Returning in-flight task %s for a duplicate submission with identical content hash.",
+                                         cached_task.id)
+                        if Settings.FileSettings.delete_temp_files_after_processing:
+                            await self.file_utils.delete_file(temp_file_path)
+                        return cached_task
+                    cached_task = None
+            else:
+                duration = await self.file_utils.get_audio_duration(temp_file_path)
         else:
             temp_file_path = None
             duration = None
             file_size_bytes = None
+            content_hash = None
 
         async with self.db_manager.get_session() as session:
             task = Task(
@@ -275,15 +296,37 @@ class WhisperService:
                 platform=platform,
                 decode_options=decode_options,
                 file_duration=duration,
+                duration_bin=self.get_duration_bin(duration),
+                content_hash=content_hash,
                 priority=priority
             )
+            # 命中缓存时直接复用结果并标记为已完成 | On a cache hit, reuse the result and mark the task as completed
+            if cached_task:
+                task.status = TaskStatus.completed
+                task.language = cached_task.language
+                task.result = cached_task.result
+                # 结果保存在文件中时共享同一个结果文件 | Share the same result file when the result is stored in a file
+                task.result_path = cached_task.result_path
+                task.task_processing_time = 0
             session.add(task)
-            await session.commit()
+            # 先 flush 获取任务ID，输出链接与任务在同一个事务中提交 | Flush to get the task ID, so the output URL is committed in the same transaction as the task
+            await session.flush()
             task_id = task.id
             # 设置任务输出链接 | Set task output URL
             task.output_url = f"{request.url_for('task_result')}?task_id={task_id}"
             await session.commit()
 
+        if cached_task:
+            self.logger.info("Reused result of task %s for task %s with identical content hash.", cached_task.id, task_id)
+            # 结果已可用，无需保留上传的临时文件 | The result is already available, the uploaded temporary file is no longer needed
+            if Settings.FileSettings.delete_temp_files_after_processing:
+                await self.file_utils.delete_file(temp_file_path)
+            if callback_url:
+                self.task_processor.enqueue_callback(task)
+        else:
+            # 通知任务处理器立即拉取新任务 | Notify the task processor to fetch the new task right away
+            self.task_processor.notify_new_task()
+
         self.logger.info(f"Created transcription task with ID: {task_id}")
         return task
 
@@ -304,25 +347,19 @@ class WhisperService:
         """
         subtitle_file_path = None
         try:
-            # 生成字幕内容 | Generate subtitle content
-            separator = "," if output_format == "srt" else "."
-            subtitle_content = "WEBVTT\n\n" if output_format == "vtt" else ""
-            subtitle_content += "\n".join(
-                f"{segment['id']}\n{self.format_time(segment['start'], separator)} --> {self.format_time(segment['end'], separator)}\n{segment['text']}\n"
-                for segment in task.result["segments"]
-            )
-            # 保存字幕文件 | Save subtitle file
-            subtitle_file_path = await self.file_utils.save_file(
-                file=subtitle_content.encode("utf-8"),
-                file_name=f"Task_{task.id}_Subtitle.{output_format}",
-                check_file_allowed=False
+            # 字幕内容在写入线程中逐段生成并写入文件，不阻塞事件循环，也不在内存中保留完整的字幕文本
+            # Subtitle content is generated and written piece by piece in the writer thread, without blocking the event loop
+            # or holding the full subtitle text in memory
+            subtitle_file_path = await self.file_utils.save_text_file(
+                content=self.iter_subtitle_content(task.result["segments"], output_format),
+                file_name=f"Task_{task.id}_Subtitle.{output_format}"
             )
 
             # 将文件删除任务添加到后台任务中确保文件在返回响应后被删除
             # Add file deletion tasks to background tasks to ensure files are deleted after response is returned
-            if Settings.FileSettings.auto_delete and subtitle_file_path:
+            if self._auto_delete and subtitle_file_path:
                 background_tasks.add_task(self.file_utils.delete_file, subtitle_file_path)
-                self.logger.debug(f"Added subtitle file to delete in background task: {subtitle_file_path}")
+                self.logger.debug("Added subtitle file to delete in background task: %s", subtitle_file_path)
 
             # 返回字幕文件 | Return subtitle file
             self.logger.info(f"Returning subtitle file for Task ID {task.id}: {subtitle_file_path}")
@@ -336,18 +373,55 @@ class WhisperService:
             self.logger.error(traceback.format_exc())
             raise RuntimeError("Failed to generate subtitle") from e
 
+    @classmethod
+    def iter_subtitle_content(cls, segments: list, output_format: str) -> Iterator[str]:
+        """
+        根据转录片段逐段生成字幕文本。
+
+        Yields the subtitle text from transcription segments piece by piece.
+
+        :param segments: 转录片段列表 | List of transcription segments
+        :param output_format: 输出格式，可选 'srt' 或 'vtt' | Output format, 'srt' or 'vtt'
+        :return: 字幕文本片段的迭代器 | Iterator of subtitle text pieces
+        """
+        separator = "," if output_format == "srt" else "."
+        format_time = cls.format_time
+        if output_format == "vtt":
+            yield "WEBVTT\n\n"
+        # 字幕块之间以空行分隔 | Subtitle blocks are separated by a blank line
+        block_separator = ""
+        for segment in segments:
+            start = format_time(round(segment['start'] * 1000), separator)
+            end = format_time(round(segment['end'] * 1000), separator)
+            yield f"{block_separator}{segment['id']}\n{start} --> {end}\n{segment['text']}\n"
+            block_separator = "\n"
+
+    @staticmethod
+    def get_duration_bin(duration: Optional[float]) -> Optional[int]:
+        """
+        根据音频时长计算所属的时长分桶。
+
+        Calculates the duration bin an audio duration belongs to.
+
+        :param duration: 音频时长（秒） | Audio duration (seconds)
+        :return: 时长分桶，时长未知或未启用分桶时返回 None | Duration bin, None if the duration is unknown or binning is disabled
+        """
+        if duration is None or not Settings.WhisperServiceSettings.DURATION_BIN_EDGES:
+            return None
+        return bisect.bisect(Settings.WhisperServiceSettings.DURATION_BIN_EDGES, duration)
+
     @staticmethod
-    def format_time(seconds: float, separator: str) -> str:
+    def format_time(milliseconds: int, separator: str) -> str:
         """
-        将秒数格式化为 SRT 字幕时间格式。
+        将毫秒数格式化为字幕时间格式，仅使用整数运算。
 
-        Formats seconds as SRT subtitle time format.
+        Formats milliseconds as subtitle time format using integer arithmetic only.
 
-        :param seconds: 要格式化的秒数 | Seconds to format
+        :param milliseconds: 要格式化的毫秒数 | Milliseconds to format
         :param separator: 分隔符 | Separator
         :return: 格式化后的时间字符串 | Formatted time string
         """
-        hours, remainder = divmod(seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}{separator}{milliseconds:03}"
+        hours, milliseconds = divmod(milliseconds, 3_600_000)
+        minutes, milliseconds = divmod(milliseconds, 60_000)
+        seconds, milliseconds = divmod(milliseconds, 1000)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
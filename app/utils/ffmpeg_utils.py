@@ -0,0 +1,118 @@
+# ==============================================================================
+# Copyright (C) 2024 Evil0ctal
+#
+# This file is part of the Whisper-Speech-to-Text-API project.
+# Github: https://github.com/Evil0ctal/Whisper-Speech-to-Text-API
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#                                     ,
+#              ,-.       _,---._ __  / \
+#             /  )    .-'       `./ /   \
+#            (  (   ,'            `/    /|
+#             \  `-"             \'\   / |
+#              `.              ,  \ \ /  |
+#               /`.          ,'-`----Y   |
+#              (            ;        |   '
+#              |  ,-.    ,-'         |  /
+#              |  | (   |  Evil0ctal | /
+#              )  |  \  `.___________|/    Whisper API Out of the Box (Where is my ⭐?)
+#              `--'   `--'
+# ==============================================================================
+
+
+import asyncio
+from typing import Optional
+
+import numpy as np
+
+# WAV 输出的位深度（字节）与 PCM 编码器的对应关系 | Mapping from WAV output bit depth (bytes) to PCM codec
+_PCM_CODECS = {1: "pcm_u8", 2: "pcm_s16le", 3: "pcm_s24le", 4: "pcm_s32le"}
+
+
+async def probe_duration(file_path: str) -> Optional[float]:
+    """
+    使用异步子进程运行 ffprobe 从文件头读取媒体时长，等待期间不占用线程池
+
+    Read the media duration from the file header by running ffprobe as an asyncio subprocess,
+    without holding a thread pool worker while waiting.
+
+    :param file_path: 文件路径 | File path
+    :return: 媒体时长（秒），无法获取时返回 None | Media duration in seconds, None if it cannot be determined
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error", "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1", file_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            return None
+        return float(stdout.strip())
+    except (OSError, ValueError):
+        return None
+
+
+async def decode_to_pcm(file_path: str, sample_rate: int = 16000) -> np.ndarray:
+    """
+    使用异步子进程运行 ffmpeg 将媒体文件解码为单声道 16 位 PCM，并直接从管道读取到 NumPy 数组，不经过中间文件
+
+    Decode a media file to mono 16-bit PCM by running ffmpeg as an asyncio subprocess, reading the pipe straight into
+    a NumPy array without an intermediate file.
+
+    :param file_path: 文件路径 | File path
+    :param sample_rate: 采样率 | Sample rate
+    :return: int16 PCM 采样数组 | int16 PCM sample array
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-nostdin", "-v", "error", "-i", file_path, "-vn",
+        "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode audio: {stderr.decode(errors='ignore').strip()}")
+    return np.frombuffer(stdout, dtype=np.int16)
+
+
+async def extract_audio(input_path: str, output_path: str, sample_rate: int, bit_depth: int, output_format: str) -> None:
+    """
+    使用异步子进程运行 ffmpeg，从视频文件中提取音轨并直接编码为目标格式，WAV 和 MP3 共用同一条命令，仅编码参数不同。
+
+    Extract the audio track from a video file by running ffmpeg as an asyncio subprocess and encode it straight to
+    the target format, WAV and MP3 share the same command and only differ in the codec arguments.
+
+    :param input_path: 输入视频路径 | Input video path
+    :param output_path: 输出音频路径 | Output audio path
+    :param sample_rate: 采样率 | Sample rate
+    :param bit_depth: 位深度（字节），仅用于 WAV | Bit depth in bytes, only used for WAV
+    :param output_format: 输出格式，'wav' 或 'mp3' | Output format, 'wav' or 'mp3'
+    :return: None
+    """
+    if output_format == "wav":
+        # 与 MoviePy 的 nbytes 含义一致：1 字节为无符号 8 位，其余为有符号小端 | Same meaning as MoviePy nbytes: 1 byte is unsigned 8-bit, others are signed little-endian
+        codec_args = ["-acodec", _PCM_CODECS.get(bit_depth, "pcm_s16le")]
+    else:
+        # 直接编码为 MP3，不经过 WAV 中间文件 | Encode straight to MP3 without an intermediate WAV file
+        codec_args = ["-acodec", "libmp3lame", "-b:a", "192k"]
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-nostdin", "-y", "-v", "error", "-i", input_path, "-vn",
+        "-ar", str(sample_rate), *codec_args, output_path,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to extract audio: {stderr.decode(errors='ignore').strip()}")
@@ -30,27 +30,32 @@
 # ==============================================================================
 
 import asyncio
+import hashlib
 import mimetypes
 import os
 import tempfile
 import aiofiles
-import uuid
+import secrets
 import re
 import stat
+import sys
 import filetype
 import traceback
 
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Any, Optional, Union
+from typing import List, Any, Optional, Union, Tuple, Iterable
 from fastapi import UploadFile
-from pydub import AudioSegment
 
+from app.utils.ffmpeg_utils import probe_duration, decode_to_pcm
 from app.utils.logging_utils import configure_logging
 from app.http_client.AsyncHttpClient import AsyncHttpClient
 
 
-# 初始化静态线程池，所有实例共享 | Initialize static thread pool, shared by all instances
-_executor = ThreadPoolExecutor()
+# filetype 识别文件类型时读取的文件头字节数 | Number of header bytes filetype reads to detect the file type
+FILE_TYPE_HEADER_SIZE = 8192
+
+# 预编译的正则表达式 | Precompiled regular expressions
+_EXT_SANITIZE_PATTERN = re.compile(r'[^\w.]')
+_CONTENT_RANGE_TOTAL_PATTERN = re.compile(r"/(\d+)$")
 
 
 class FileUtils:
@@ -113,6 +118,9 @@ class FileUtils:
                 os.chmod(self.TEMP_DIR, stat.S_IRWXU)
             self.logger.debug(f"Using system temporary directory {self.TEMP_DIR}")
 
+        # 缓存解析符号链接后的临时目录前缀，路径检查无需每次重新解析 | Cache the symlink-resolved TEMP_DIR prefix, so path checks do not resolve it again every time
+        self._TEMP_DIR_REAL = os.path.realpath(self.TEMP_DIR) + os.sep
+
         # 配置类属性 | Configure class attributes
         self.AUTO_DELETE = auto_delete
         self.LIMIT_FILE_SIZE = limit_file_size
@@ -123,6 +131,9 @@ class FileUtils:
 
         # 定义允许的文件扩展名 | Define allowed file extensions
         self.ALLOWED_EXTENSIONS = allowed_extensions
+        # 只保留允许类型的匹配器，检测时无需逐个尝试所有已知格式 | Keep only the matchers of allowed types, so detection does not try every known format
+        allowed = {extension.lower() for extension in allowed_extensions or ()}
+        self._allowed_matchers = [matcher for matcher in filetype.types if f'.{matcher.extension}' in allowed]
 
     async def download_file_from_url(self, file_url: str) -> str:
         """
@@ -136,7 +147,7 @@ class FileUtils:
         async with AsyncHttpClient(follow_redirects=True) as client:
             try:
                 # 使用 GET 请求检查文件大小和类型 | Use a GET request to check the file size and type
-                response = await client.fetch_data("GET", file_url, headers={"Range": "bytes=0-1023"})
+                response = await client.fetch_data("GET", file_url, headers={"Range": f"bytes=0-{FILE_TYPE_HEADER_SIZE - 1}"})
                 content_range = response.headers.get("Content-Range")
                 content_type = response.headers.get("Content-Type")
 
@@ -147,17 +158,16 @@ class FileUtils:
 
                 # 生成唯一的安全文件名，包含扩展名 | Generate a unique file name with the extension
                 file_name = self._generate_safe_file_name(os.path.basename(file_url)) + extension
-                file_path = os.path.join(self.TEMP_DIR, file_name)
-                file_path = os.path.realpath(file_path)
+                file_path = self._resolve_temp_path(os.path.join(self.TEMP_DIR, file_name))
 
                 # 确保文件路径在 TEMP_DIR 内部 | Ensure file path is within TEMP_DIR
-                if not file_path.startswith(os.path.realpath(self.TEMP_DIR) + os.sep):
+                if not file_path.startswith(self._TEMP_DIR_REAL):
                     self.logger.error(f"Invalid file path detected: {file_path}")
                     raise ValueError("Invalid file path detected.")
 
                 # 检查文件大小限制 | Check file size if Content-Range is supported
                 if content_range:
-                    match = re.search(r"/(\d+)$", content_range)
+                    match = _CONTENT_RANGE_TOTAL_PATTERN.search(content_range)
                     if match:
                         file_size = int(match.group(1))
                         if self.LIMIT_FILE_SIZE and file_size > self.MAX_FILE_SIZE:
@@ -165,16 +175,15 @@ class FileUtils:
                             self.logger.error(error_msg)
                             raise ValueError(error_msg)
 
-                # 开始完整下载文件 | Start full download of the file
-                await client.download_file(file_url, file_path, chunk_size=self.CHUNK_SIZE)
-
-                # 检查文件类型是否允许 | Check if file type is allowed
-                if not self.is_allowed_file_type(file_path):
+                # 用已获取的文件头检查文件类型，不支持的文件无需下载 | Check the file type from the header already fetched, unsupported files are never downloaded
+                if not self.is_allowed_file_type(response.content[:FILE_TYPE_HEADER_SIZE]):
                     error_msg = f"File type from URL {file_url} is not supported."
                     self.logger.error(error_msg)
-                    await self.delete_file(file_path)
                     raise ValueError(error_msg)
 
+                # 开始完整下载文件 | Start full download of the file
+                await client.download_file(file_url, file_path, chunk_size=self.CHUNK_SIZE)
+
                 # 设置文件权限，仅所有者可读写 | Set file permissions to 600
                 if os.name != 'nt':
                     await asyncio.to_thread(os.chmod, file_path, stat.S_IRUSR | stat.S_IWUSR)
@@ -201,19 +210,7 @@ class FileUtils:
         :param check_file_allowed: 检查文件类型是否被允许，默认为True | Check if the file type is allowed, default is True.
         :return: 保存的文件路径 | Path to the saved file.
         """
-        safe_file_name = self._generate_safe_file_name(file_name) if generate_safe_file_name else file_name
-        file_path = os.path.join(self.TEMP_DIR, safe_file_name)
-        file_path = os.path.realpath(file_path)
-
-        # 确保文件路径在 TEMP_DIR 内部 | Ensure file path is within TEMP_DIR
-        if not file_path.startswith(os.path.realpath(self.TEMP_DIR) + os.sep):
-            self.logger.error(f"Invalid file path detected: {file_path}")
-            raise ValueError("Invalid file path detected.")
-
-        # 检查是否为符号链接 | Check if the path is a symbolic link
-        if os.path.islink(file_path):
-            self.logger.error(f"Symbolic links are not allowed: {file_path}")
-            raise ValueError("Invalid file path detected.")
+        file_path = self._get_safe_file_path(file_name, generate_safe_file_name)
 
         try:
             # 检查文件大小限制 | Check file size limit
@@ -222,6 +219,12 @@ class FileUtils:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
 
+            # 文件类型验证，直接检查内存中的文件头，无需写入后重新打开 | File type validation on the in-memory header, without reopening the written file
+            if check_file_allowed and not self.is_allowed_file_type(file[:FILE_TYPE_HEADER_SIZE]):
+                error_msg = f"File type: {file_name} is not supported."
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+
             # 异步写入文件 | Asynchronously write file
             async with aiofiles.open(file_path, 'wb') as f:
                 await f.write(file)
@@ -230,13 +233,36 @@ class FileUtils:
             if os.name != 'nt':
                 await asyncio.to_thread(os.chmod, file_path, stat.S_IRUSR | stat.S_IWUSR)
 
-            # 文件类型验证 | File type validation
-            if check_file_allowed and not self.is_allowed_file_type(file_path):
-                error_msg = f"File type: {file_name} is not supported."
-                self.logger.error(error_msg)
-                await self.delete_file(file_path)
-                raise ValueError(error_msg)
+            self.logger.debug("File saved successfully.")
+            return file_path
+        except (OSError, IOError) as e:
+            self.logger.error(f"Failed to save file due to an exception: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            raise ValueError("An error occurred while saving the file.")
+
+    async def save_text_file(self, content: Iterable[str], file_name: str, generate_safe_file_name: bool = True) -> str:
+        """
+        在线程中将逐段生成的文本以 UTF-8 编码流式写入临时目录，不在内存中拼接完整的字符串和字节内容
+
+        Stream text produced piece by piece to the temporary directory as UTF-8 in a worker thread,
+        without assembling the full string and byte content in memory.
 
+        :param content: 文本片段的可迭代对象，会在写入线程中被消费 | Iterable of text pieces, consumed in the writer thread.
+        :param file_name: 原始文件名 | Original file name.
+        :param generate_safe_file_name: 是否生成安全的文件名，默认为True | Whether to generate a safe file name, default is True.
+        :return: 保存的文件路径 | Path to the saved file.
+        """
+        file_path = self._get_safe_file_path(file_name, generate_safe_file_name)
+
+        def write_text() -> None:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.writelines(content)
+            # 设置文件权限，仅所有者可读写 | Set file permissions to 600
+            if os.name != 'nt':
+                os.chmod(file_path, stat.S_IRUSR | stat.S_IWUSR)
+
+        try:
+            await asyncio.to_thread(write_text)
             self.logger.debug("File saved successfully.")
             return file_path
         except (OSError, IOError) as e:
@@ -254,15 +280,162 @@ class FileUtils:
         :param file_name: 原始文件名 | Original file name.
         :return: 保存的文件路径 | Path to the saved file.
         """
-        if type(file).__name__ == "UploadFile":
-            # 读取文件内容 | Read content of UploadFile
-            content = await file.read()
-        else:
+        file_path, _, _ = await self._save_upload(file, file_name, hasher=None)
+        return file_path
+
+    async def save_uploaded_file_with_hash(self, file: Union[UploadFile, bytes], file_name: str) -> Tuple[str, str, int]:
+        """
+        保存FastAPI上传的文件到临时目录，并在写入的同一次遍历中计算文件内容的 SHA-256 哈希值和文件大小
+
+        Save an uploaded file from FastAPI to the temporary directory, computing the SHA-256 hash of its content
+        and its size in the same pass as the write.
+
+        :param file: FastAPI上传的文件对象或字节内容 | File object or byte content uploaded from FastAPI.
+        :param file_name: 原始文件名 | Original file name.
+        :return: 保存的文件路径、十六进制哈希字符串和文件字节数 | Path to the saved file, hexadecimal hash string and file size in bytes.
+        """
+        file_path, file_size, sha256 = await self._save_upload(file, file_name, hasher=hashlib.sha256())
+        return file_path, sha256.hexdigest(), file_size
+
+    async def _save_upload(self, file: Union[UploadFile, bytes], file_name: str,
+                           hasher: Optional[Any]) -> Tuple[str, int, Any]:
+        """
+        以固定大小的块将上传内容流式写入临时目录，可选地同时更新哈希对象，避免将整个文件读入内存
+
+        Stream the uploaded content to the temporary directory in fixed-size chunks, optionally updating a hash object
+        at the same time, without reading the whole file into memory.
+
+        :param file: FastAPI上传的文件对象或字节内容 | File object or byte content uploaded from FastAPI.
+        :param file_name: 原始文件名 | Original file name.
+        :param hasher: hashlib 哈希对象，为 None 时不计算哈希 | hashlib hash object, no hash is computed if None.
+        :return: 保存的文件路径、写入的字节数和哈希对象 | Path to the saved file, number of bytes written and the hash object.
+        """
+        if type(file).__name__ != "UploadFile":
             # 如果已经是字节内容，直接使用 | If already bytes, use as is
-            content = file
+            if hasher is not None:
+                hasher.update(file)
+            return await self.save_file(file, file_name), len(file), hasher
+
+        # 上传大小已知时直接拒绝超限文件，无需写入磁盘 | Reject oversized uploads up front when their size is known, without writing to disk
+        upload_size = getattr(file, "size", None)
+        if self.LIMIT_FILE_SIZE and upload_size is not None and upload_size > self.MAX_FILE_SIZE:
+            error_msg = f"File size exceeds the limit: {upload_size} > {self.MAX_FILE_SIZE}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        file_path = self._get_safe_file_path(file_name)
+        try:
+            # 整个复制在一次线程调用中完成，而不是每个块的读取和写入各切换一次线程
+            # The whole copy runs in one thread hop instead of one hop per chunk for the read and again for the write
+            written = await asyncio.to_thread(self._copy_upload, file.file, file_path, file_name, hasher)
+            self.logger.debug("File saved successfully.")
+            return file_path, written, hasher
+        except ValueError:
+            await self.delete_file(file_path)
+            raise
+        except (OSError, IOError) as e:
+            self.logger.error(f"Failed to save file due to an exception: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            await self.delete_file(file_path)
+            raise ValueError("An error occurred while saving the file.")
 
-        # 使用 save_file 方法保存文件 | Use save_file method to save the file
-        return await self.save_file(content, file_name)
+    def _copy_upload(self, source: Any, file_path: str, file_name: str, hasher: Optional[Any]) -> int:
+        """
+        将上传的临时文件复制到目标路径。先用文件头验证类型，不需要计算哈希且上传已落盘时使用 sendfile 在内核中复制，
+        否则按块读取、更新哈希并写入。目标文件以 600 权限创建。
+
+        Copy the spooled upload to the target path. The file type is validated from the header first; when no hash is
+        needed and the upload has rolled over to disk, the data is copied in the kernel with sendfile, otherwise it is
+        read in chunks, hashed and written. The target file is created with 600 permissions.
+
+        :param source: 上传文件底层的文件对象 | File object underlying the upload.
+        :param file_path: 目标文件路径 | Target file path.
+        :param file_name: 原始文件名 | Original file name.
+        :param hasher: hashlib 哈希对象，为 None 时不计算哈希 | hashlib hash object, no hash is computed if None.
+        :return: 写入的字节数 | Number of bytes written.
+        """
+        # 用文件头验证文件类型，不支持的文件不会写入，空文件同样在此验证 | Validate the file type from the header, unsupported files are never written, empty files are validated here too
+        header = source.read(FILE_TYPE_HEADER_SIZE)
+        if not self.is_allowed_file_type(header):
+            error_msg = f"File type: {file_name} is not supported."
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        def check_size(size: int) -> None:
+            # 检查文件大小限制 | Check file size limit
+            if self.LIMIT_FILE_SIZE and size > self.MAX_FILE_SIZE:
+                error_msg = f"File size exceeds the limit: > {self.MAX_FILE_SIZE}"
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+
+        # 创建时即设置权限，仅所有者可读写 | Set permissions at creation, owner read/write only
+        target_fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+                            stat.S_IRUSR | stat.S_IWUSR)
+        with open(target_fd, 'wb') as target:
+            target.write(header)
+            written = len(header)
+            if hasher is not None:
+                hasher.update(header)
+
+            # 仍在内存中的上传没有文件描述符，访问 fileno 会迫使其写入磁盘 | An upload still in memory has no descriptor, accessing fileno would force it to disk
+            if hasher is None and sys.platform.startswith("linux") and getattr(source, "_rolled", True):
+                target.flush()
+                source_fd, offset = source.fileno(), source.tell()
+                while sent := os.sendfile(target_fd, source_fd, offset, self.CHUNK_SIZE * 64):
+                    offset += sent
+                    written += sent
+                    check_size(written)
+                return written
+
+            while chunk := source.read(self.CHUNK_SIZE):
+                written += len(chunk)
+                check_size(written)
+                if hasher is not None:
+                    hasher.update(chunk)
+                target.write(chunk)
+        return written
+
+    def _resolve_temp_path(self, file_path: str) -> str:
+        """
+        规范化路径用于临时目录内部检查。已解析的临时目录的直接子项只做字符串规范化，其余路径才调用 realpath 逐级解析符号链接；
+        末级符号链接由调用方处理。
+
+        Normalize a path for the TEMP_DIR containment check. Direct children of the resolved TEMP_DIR are only normalized
+        as strings, other paths go through realpath to resolve symbolic links component by component; a symbolic link
+        as the last component is handled by the callers.
+
+        :param file_path: 文件路径 | File path.
+        :return: 规范化后的路径 | Normalized path.
+        """
+        file_path = os.path.abspath(file_path)
+        if os.path.dirname(file_path) + os.sep == self._TEMP_DIR_REAL:
+            return file_path
+        return os.path.realpath(file_path)
+
+    def _get_safe_file_path(self, file_name: str, generate_safe_file_name: bool = True) -> str:
+        """
+        生成位于临时目录内的安全文件路径，并拒绝目录穿越和符号链接
+
+        Build a safe file path inside the temporary directory, rejecting directory traversal and symbolic links.
+
+        :param file_name: 原始文件名 | Original file name.
+        :param generate_safe_file_name: 是否生成安全的文件名，默认为True | Whether to generate a safe file name, default is True.
+        :return: 安全的文件路径 | Safe file path.
+        """
+        safe_file_name = self._generate_safe_file_name(file_name) if generate_safe_file_name else file_name
+        file_path = self._resolve_temp_path(os.path.join(self.TEMP_DIR, safe_file_name))
+
+        # 确保文件路径在 TEMP_DIR 内部 | Ensure file path is within TEMP_DIR
+        if not file_path.startswith(self._TEMP_DIR_REAL):
+            self.logger.error(f"Invalid file path detected: {file_path}")
+            raise ValueError("Invalid file path detected.")
+
+        # 检查是否为符号链接 | Check if the path is a symbolic link
+        if os.path.islink(file_path):
+            self.logger.error(f"Symbolic links are not allowed: {file_path}")
+            raise ValueError("Invalid file path detected.")
+
+        return file_path
 
     async def delete_files_in_batch(self, file_paths: List[str]) -> None:
         """
@@ -289,6 +462,21 @@ class FileUtils:
             self.logger.error(traceback.format_exc())
             raise ValueError("An error occurred while deleting files.")
 
+    @staticmethod
+    def _unlink_regular_file(file_path: str) -> bool:
+        """
+        仅当路径为常规文件时删除它，lstat 不跟随符号链接，符号链接会在此被拒绝。
+
+        Delete the path only if it is a regular file, lstat does not follow symbolic links so they are rejected here.
+
+        :param file_path: 要删除的文件路径 | Path of the file to delete
+        :return: 是否已删除 | Whether the file was deleted
+        """
+        if not stat.S_ISREG(os.lstat(file_path).st_mode):
+            return False
+        os.unlink(file_path)
+        return True
+
     async def delete_file(self, file_path: str, retries: int = 3, delay: float = 0.5) -> None:
         """
         异步删除单个文件，带有重试机制
@@ -300,33 +488,25 @@ class FileUtils:
         :param delay: 每次重试之间的延迟时间（秒） | Delay time between retries in seconds
         :return: None
         """
-        file_path = os.path.realpath(file_path)
+        file_path = self._resolve_temp_path(file_path)
 
         # 确保文件路径在 TEMP_DIR 内部 | Ensure file path is within TEMP_DIR
-        if not file_path.startswith(os.path.realpath(self.TEMP_DIR) + os.sep):
+        if not file_path.startswith(self._TEMP_DIR_REAL):
             self.logger.warning(f"Attempted to delete file outside of TEMP_DIR: {file_path}")
             return
 
-        # 检查是否为符号链接 | Check if the path is a symbolic link
-        if os.path.islink(file_path):
-            self.logger.warning(f"Symbolic links are not allowed: {file_path}")
-            return
-
         for attempt in range(retries):
             try:
-                # 检查文件是否为常规文件 | Check if the file is a regular file
-                file_stat = await asyncio.to_thread(os.lstat, file_path)
-                if not stat.S_ISREG(file_stat.st_mode):
+                # lstat 和 unlink 在本地文件系统上只需微秒，直接调用比切换到线程更快
+                # lstat and unlink take microseconds on a local filesystem, calling them directly is cheaper than a thread hop
+                if not self._unlink_regular_file(file_path):
                     self.logger.warning(f"Not a regular file: {file_path}")
                     return
-
-                # 尝试异步删除文件 | Attempt to delete the file asynchronously
-                await asyncio.to_thread(os.remove, file_path)
-                self.logger.debug(f"File deleted successfully: {file_path}")
+                self.logger.debug("File deleted successfully: %s", file_path)
                 return
 
             except FileNotFoundError:
-                self.logger.warning(f"File not found: {file_path}")
+                self.logger.debug("File already removed: %s", file_path)
                 return  # 无需重试 | No need to retry if file is not found
 
             except PermissionError as e:
@@ -353,23 +533,29 @@ class FileUtils:
         """
         if self.AUTO_DELETE:
             try:
-                # 获取临时目录中的所有文件路径 | Get all file paths in TEMP_DIR
-                file_paths = [
-                    os.path.join(self.TEMP_DIR, f)
-                    for f in os.listdir(self.TEMP_DIR)
-                    if os.path.isfile(os.path.join(self.TEMP_DIR, f))
-                ]
-                self.logger.debug(f"Found {len(file_paths)} temporary files.")
-                # 分批删除文件 | Delete files in batches
-                for i in range(0, len(file_paths), self.DELETE_BATCH_SIZE):
-                    batch = file_paths[i:i + self.DELETE_BATCH_SIZE]
-                    await self.delete_files_in_batch(batch)
-                self.logger.debug(f"All temporary files have been cleaned up.")
+                # 在线程中获取临时目录中的所有文件路径，scandir 可直接从目录项判断类型，无需逐个 stat
+                # Get all file paths in TEMP_DIR in a thread, scandir reads the type from the directory entry without a stat per file
+                file_paths = await asyncio.to_thread(self._list_temp_files)
+                self.logger.debug("Found %d temporary files.", len(file_paths))
+                # 一次提交全部文件，并发数由 delete_files_in_batch 内的信号量限制 | Submit all files at once, concurrency is bounded by the semaphore in delete_files_in_batch
+                await self.delete_files_in_batch(file_paths)
+                self.logger.debug("All temporary files have been cleaned up.")
             except (OSError, IOError) as e:
                 self.logger.error(f"Failed to clean up temporary files due to an exception: {str(e)}")
                 self.logger.error(traceback.format_exc())
                 raise ValueError("An error occurred while cleaning up temporary files.")
 
+    def _list_temp_files(self) -> List[str]:
+        """
+        列出临时目录中的常规文件
+
+        List the regular files in the temporary directory.
+
+        :return: 文件路径列表 | List of file paths.
+        """
+        with os.scandir(self.TEMP_DIR) as entries:
+            return [entry.path for entry in entries if entry.is_file(follow_symlinks=False)]
+
     def _generate_safe_file_name(self, original_name: str) -> str:
         """
         生成安全且唯一的文件名
@@ -381,39 +567,33 @@ class FileUtils:
         """
         # 获取文件的扩展名，并限制为合法字符 | Get file extension and allow only safe characters
         _, ext = os.path.splitext(original_name)
-        ext = re.sub(r'[^\w\.]', '', ext)
+        ext = _EXT_SANITIZE_PATTERN.sub('', ext)
         ext = ext.lower()
         if len(ext) > 10:
             ext = ext[:10]
         # 生成唯一的文件名 | Generate a unique file name
-        unique_name = f"{uuid.uuid4().hex}{ext}"
-        self.logger.debug(f"Generated unique file name: {unique_name}")
+        unique_name = f"{secrets.token_hex(16)}{ext}"
+        self.logger.debug("Generated unique file name: %s", unique_name)
         return unique_name
 
-    def is_allowed_file_type(self, file_path: str) -> bool:
+    def is_allowed_file_type(self, file: Union[str, bytes]) -> bool:
         """
-        检查文件是否为允许的类型
+        检查文件是否为允许的类型，传入文件头字节时无需打开文件
 
-        Check if the file is of an allowed type.
+        Check if the file is of an allowed type, the file is not opened when its header bytes are passed.
 
-        :param file_path: 文件路径 | Path to the file.
+        :param file: 文件路径或文件头字节 | Path to the file or its header bytes.
         :return: 如果文件类型被允许则返回True，否则返回False | True if the file type is allowed, False otherwise.
         """
         try:
             # 如果 ALLOWED_EXTENSIONS 为空，则不限制文件类型 | If ALLOWED_EXTENSIONS is empty, do not restrict file types
             if not self.ALLOWED_EXTENSIONS:
                 return True
-            # 使用 filetype 库检测文件类型 | Detect file type using filetype library
-            kind = filetype.guess(file_path)
-            if kind is None:
-                self.logger.error("Unable to determine file type.")
-                return False
-            ext = f'.{kind.extension}'.lower()
-            if ext in self.ALLOWED_EXTENSIONS:
-                return True
-            else:
-                self.logger.error(f"File type {ext} is not supported.")
+            # 使用 filetype 库检测文件类型，仅尝试允许类型的匹配器 | Detect file type using filetype library, trying only the matchers of allowed types
+            if filetype.match(file, matchers=self._allowed_matchers) is None:
+                self.logger.error("File type is not one of the allowed types.")
                 return False
+            return True
         except Exception as e:
             self.logger.error(f"Unable to determine file type: {str(e)}")
             self.logger.error(traceback.format_exc())
@@ -429,24 +609,21 @@ class FileUtils:
         :return: 音频文件时长（秒） | Audio file duration (seconds)
         :raises: ValueError: 获取音频时长时发生错误 | An error occurred while getting the audio duration
         """
-        # 初始化 audio 变量 | Initialize audio variable
-        audio = None
         try:
-            self.logger.debug(f"Getting duration of audio file: {temp_file_path}")
-            audio = await asyncio.get_running_loop().run_in_executor(
-                _executor, lambda: AudioSegment.from_file(temp_file_path)
-            )
-            duration = len(audio) / 1000.0
-            self.logger.debug(f"Audio file duration: {duration:.2f} seconds")
+            self.logger.debug("Getting duration of audio file: %s", temp_file_path)
+            # 优先使用 ffprobe 读取容器头信息，无需解码整个文件 | Prefer ffprobe to read the container header without decoding the whole file
+            duration = await probe_duration(temp_file_path)
+            if duration is None:
+                # 无法从头信息获取时长时回退到完整解码，按采样数计算时长 | Fall back to a full decode when the header has no duration, counting samples
+                self.logger.debug("ffprobe could not determine duration, falling back to full decode.")
+                pcm = await decode_to_pcm(temp_file_path, 16000)
+                duration = len(pcm) / 16000
+            self.logger.debug("Audio file duration: %.2f seconds", duration)
             return duration
         except Exception as e:
             self.logger.error(f"Failed to get audio duration: {str(e)}")
             self.logger.error(traceback.format_exc())
             raise ValueError("An error occurred while getting the audio duration.")
-        finally:
-            # 确保释放文件资源 | Ensure the file resource is released
-            if audio is not None:
-                del audio
 
     async def __aenter__(self) -> 'FileUtils':
         """
@@ -0,0 +1,121 @@
+# ==============================================================================
+# Copyright (C) 2024 Evil0ctal
+#
+# This file is part of the Whisper-Speech-to-Text-API project.
+# Github: https://github.com/Evil0ctal/Whisper-Speech-to-Text-API
+#
+# This project is licensed under the Apache License 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+#                                     ,
+#              ,-.       _,---._ __  / \
+#             /  )    .-'       `./ /   \
+#            (  (   ,'            `/    /|
+#             \  `-"             \'\   / |
+#              `.              ,  \ \ /  |
+#               /`.          ,'-`----Y   |
+#              (            ;        |   '
+#              |  ,-.    ,-'         |  /
+#              |  | (   |  Evil0ctal | /
+#              )  |  \  `.___________|/    Whisper API Out of the Box (Where is my ⭐?)
+#              `--'   `--'
+# ==============================================================================
+
+
+import gzip
+import json
+import os
+from typing import Optional
+
+from config.settings import Settings
+
+
+# 压缩结果文件的扩展名 | Extension of compressed result files
+_COMPRESSED_SUFFIX = ".json.gz"
+
+
+def get_result_file_path(task_id: int,
+                         result_dir: str = Settings.FileSettings.result_files_dir,
+                         compress: bool = Settings.FileSettings.compress_result_files) -> str:
+    """
+    获取任务结果文件的路径。
+
+    Get the path of a task's result file.
+
+    :param task_id: 任务ID | Task ID
+    :param result_dir: 结果文件目录 | Result file directory
+    :param compress: 是否为压缩结果文件 | Whether the result file is compressed
+    :return: 结果文件路径 | Result file path
+    """
+    return os.path.join(os.path.abspath(result_dir), f"{task_id}{_COMPRESSED_SUFFIX if compress else '.json'}")
+
+
+def save_result_file(task_id: int, result: dict,
+                     result_dir: str = Settings.FileSettings.result_files_dir,
+                     compress: bool = Settings.FileSettings.compress_result_files) -> str:
+    """
+    将任务结果写入文件，先写入临时文件再原子替换，读取方不会看到写了一半的文件。
+    启用压缩时以紧凑 JSON 写入 gzip 文件，片段中重复的键可压缩数倍。
+
+    Write a task result to a file, writing to a temporary file first and atomically replacing it,
+    so readers never see a partially written file. When compression is enabled, compact JSON is
+    written to a gzip file, shrinking the repeated segment keys several times over.
+
+    :param task_id: 任务ID | Task ID
+    :param result: 任务结果 | Task result
+    :param result_dir: 结果文件目录 | Result file directory
+    :param compress: 是否压缩结果文件 | Whether to compress the result file
+    :return: 结果文件路径 | Result file path
+    """
+    file_path = get_result_file_path(task_id, result_dir, compress)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temp_path = f"{file_path}.tmp"
+    if compress:
+        # 压缩级别 3 在速度和压缩率之间折中 | Compression level 3 trades off speed and ratio
+        with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=3) as f:
+            json.dump(result, f, ensure_ascii=False, separators=(",", ":"))
+    else:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+    os.replace(temp_path, file_path)
+    return file_path
+
+
+def load_result_file(file_path: str) -> Optional[dict]:
+    """
+    读取任务结果文件，按扩展名识别压缩文件，文件不存在时返回 None。
+
+    Read a task result file, detecting compressed files by extension, returns None if the file does not exist.
+
+    :param file_path: 结果文件路径 | Result file path
+    :return: 任务结果 | Task result
+    """
+    opener = gzip.open if file_path.endswith(_COMPRESSED_SUFFIX) else open
+    try:
+        with opener(file_path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def delete_result_file(file_path: str) -> None:
+    """
+    删除任务结果文件，文件不存在时忽略。
+
+    Delete a task result file, ignored if the file does not exist.
+
+    :param file_path: 结果文件路径 | Result file path
+    :return: None
+    """
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
@@ -98,6 +98,21 @@ class Settings:
         # 检查任务状态的时间间隔（秒），如果设置过小可能会导致数据库查询频繁，设置过大可能会导致任务状态更新不及时。
         # Time interval for checking task status (seconds). If set too small, it may cause frequent database queries.
         TASK_STATUS_CHECK_INTERVAL: int = 3
+        # 在 CPU 上使用 openai_whisper 引擎时，是否使用多进程执行转录以绕过 GIL（默认开启），每个工作进程加载一份模型，模型池此时不在主进程中加载模型
+        # Whether to run openai_whisper transcription in worker processes when on CPU to bypass the GIL (on by default); each worker process loads its own copy of the model and the model pool then loads none in the main process
+        USE_PROCESS_POOL_ON_CPU: bool = True
+        # 是否根据文件内容哈希复用已完成任务的转录结果，相同文件和参数的任务将直接完成 | Whether to reuse results of completed tasks by file content hash, tasks with the same file and parameters complete immediately
+        ENABLE_RESULT_CACHE: bool = True
+        # 是否对重复提交进行去重：相同文件、参数和回调地址的任务尚在排队或处理中时，直接返回原任务而不创建新任务（默认关闭） | Whether to deduplicate resubmissions: while a task with the same file, parameters and callback URL is still queued or processing, return the original task instead of creating a new one (off by default)
+        DEDUPLICATE_IN_FLIGHT_TASKS: bool = False
+        # 是否将多个不超过 30 秒且解码选项相同的短音频任务合并为一次批量推理（仅 openai_whisper 引擎） | Whether to merge short audio tasks (up to 30 seconds) with identical decode options into one batched inference (openai_whisper engine only)
+        BATCH_SHORT_AUDIO_TASKS: bool = True
+        # 为短音频任务保留的并发槽位数，避免短任务排在长任务之后等待，仅在并发数大于 1 时生效 | Concurrency slots reserved for short audio tasks so they do not queue behind long ones, only effective when concurrency is greater than 1
+        SHORT_TASK_RESERVED_SLOTS: int = 1
+        # 短音频任务的时长上限（秒） | Maximum duration of a short audio task (seconds)
+        SHORT_TASK_MAX_DURATION: float = 60
+        # 按音频时长分桶的边界（秒），任务按桶轮流认领，使同时处理的任务时长相近，为空列表时不分桶 | Audio duration bin edges (seconds), tasks are claimed from the bins in turn so concurrently processed tasks have similar durations, no binning when the list is empty
+        DURATION_BIN_EDGES: list = [60, 300, 1800]
 
     # OpenAI Whisper 设置 | OpenAI Whisper settings
     class OpenAIWhisperSettings:
@@ -109,6 +124,8 @@ class Settings:
         openai_whisper_download_root: Optional[str] = None
         # 是否在内存中加载模型 | Whether to load the model in memory
         openai_whisper_in_memory: bool = False
+        # 是否在 GPU 上使用 torch.compile 编译编码器，输入形状固定，首次推理时会额外花费编译时间 | Whether to compile the encoder with torch.compile on GPU, its input shape is fixed, the first inference spends extra time compiling
+        openai_whisper_compile_encoder: bool = False
 
     # Faster Whisper 设置 | Faster Whisper settings
     class FasterWhisperSettings:
@@ -118,14 +135,22 @@ class Settings:
         faster_whisper_device: str = "auto"
         # 设备ID，当 faster_whisper_device 为 "cuda" 时有效 | Device ID, valid when faster_whisper_device is "cuda"
         faster_whisper_device_index: int = 0
-        # 模型推理计算类型 | Model inference calculation type
-        faster_whisper_compute_type: str = "float16"
+        # GPU 上的模型推理计算类型，为 "auto" 时按 GPU 计算能力选择：Turing 及更新为 int8_float16，Volta 为 float16，Pascal 为 int8，更早为 float32，需要更高精度时可设置为 float16
+        # Model inference calculation type on GPU, chosen from the GPU compute capability when "auto": int8_float16 on Turing and newer, float16 on Volta, int8 on Pascal, float32 on older; set to float16 if higher precision is needed
+        faster_whisper_compute_type: str = "auto"
+        # 在 CPU 上运行时的模型推理计算类型，int8 可显著减少内存带宽占用 | Model inference calculation type when running on CPU, int8 greatly reduces memory bandwidth
+        faster_whisper_cpu_compute_type: str = "int8"
         # 模型使用的CPU线程数，设置为 0 时使用所有可用的CPU线程 | The number of CPU threads used by the model, set to 0 to use all available CPU threads
         faster_whisper_cpu_threads: int = 0
         # 模型worker数 | Model worker count
         faster_whisper_num_workers: int = 1
         # 模型下载根目录 | Model download root directory
         faster_whisper_download_root: Optional[str] = None
+        # 批量推理的批大小，大于 0 时使用 BatchedInferencePipeline 将音频切片按批次送入 GPU，设置为 0 时禁用，GPU 上建议 8 ~ 16
+        # Batch size for batched inference, when greater than 0 BatchedInferencePipeline feeds audio chunks to the GPU in batches, set to 0 to disable, 8 ~ 16 is recommended on GPU
+        faster_whisper_batch_size: int = 0
+        # 请求未指定时使用的束搜索宽度，1 为贪心解码，解码开销远低于 faster_whisper 默认的 5 | Beam size used when the request does not specify one, 1 is greedy decoding and costs far less than the faster_whisper default of 5
+        faster_whisper_beam_size: int = 1
 
     # 异步模型池设置 | Asynchronous model pool settings
     class AsyncModelPoolSettings:
@@ -146,6 +171,9 @@ class Settings:
         # 是否在模型池初始化时以最大的模型池大小创建模型实例 | Whether to create model instances with the maximum model pool size when the model pool is initialized
         init_with_max_pool_size: bool = True
 
+        # 是否在模型加载后用一秒静音预热，让首个请求不承担 CUDA 内核选择和编译的开销 | Whether to warm up each model with one second of silence after loading, so the first request does not pay for CUDA kernel selection and compilation
+        warmup_on_load: bool = True
+
     # 文件设置 | File settings
     class FileSettings:
         # 是否自动删除临时文件 | Whether to automatically delete temporary files
@@ -158,6 +186,12 @@ class Settings:
         temp_files_dir: str = "./temp_files"
         # 是否在处理后删除临时文件 | Whether to delete temporary files after processing
         delete_temp_files_after_processing: bool = True
+        # 是否将转录结果保存为文件而非数据库 JSON 列，避免大结果拖慢数据库 | Whether to store transcription results as files instead of the database JSON column, so large results do not slow down the database
+        store_results_in_files: bool = True
+        # 转录结果文件目录 | Transcription result file directory
+        result_files_dir: str = "./result_files"
+        # 是否以 gzip 压缩结果文件，重复的 JSON 键压缩率高 | Whether to gzip-compress result files, repeated JSON keys compress well
+        compress_result_files: bool = True
         # 允许保存的文件类型，加强服务器安全性，为空列表时不限制 | Allowed file types, enhance server security, no restrictions when the list is empty
         allowed_file_types: list = [
             # （FFmpeg 支持的媒体文件）| (FFmpeg supported media files)
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from app.database.DatabaseManager import DatabaseManager
+
+
+@pytest.fixture
+def run_with_db(tmp_path):
+    """
+    在新的事件循环中使用临时 SQLite 数据库运行测试场景协程，结束后释放数据库连接。
+
+    Runs a test scenario coroutine against a temporary SQLite database in a new event loop,
+    disposing of the database connections afterwards.
+    """
+    def run(scenario):
+        async def main():
+            db_manager = DatabaseManager("sqlite", f"sqlite+aiosqlite:///{tmp_path / 'tasks.db'}")
+            await db_manager.initialize()
+            try:
+                await scenario(db_manager)
+            finally:
+                await db_manager._engine.dispose()
+
+        asyncio.run(main())
+
+    return run
@@ -0,0 +1,56 @@
+import multiprocessing
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+from app.model_pool.model_loader import load_openai_whisper_model
+from app.processors.transcription_worker import initialize_worker, transcribe_in_worker
+
+# 使用多语言词表的最小模型，随机权重即可走通完整的转录流程 | Smallest model with the multilingual vocabulary, random weights are enough to run a full transcription
+DIMS = dict(n_mels=80, n_audio_ctx=1500, n_audio_state=16, n_audio_head=2, n_audio_layer=1,
+            n_vocab=51865, n_text_ctx=448, n_text_state=16, n_text_head=2, n_text_layer=1)
+
+
+@pytest.fixture(scope="module")
+def fp16_checkpoint(tmp_path_factory):
+    torch.manual_seed(0)
+    model = Whisper(ModelDimensions(**DIMS)).half()
+    path = tmp_path_factory.mktemp("model") / "tiny-fp16.pt"
+    torch.save({"dims": DIMS, "model_state_dict": model.state_dict()}, path)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def audio_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("audio") / "noise.wav"
+    samples = (np.random.default_rng(0).uniform(-0.1, 0.1, 16000) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(samples.tobytes())
+    return str(path)
+
+
+DECODE_OPTIONS = {"temperature": 0.0, "language": "en", "sample_len": 8}
+
+
+def test_fp16_checkpoint_loads_as_fp32_and_transcribes(fp16_checkpoint):
+    model = load_openai_whisper_model(fp16_checkpoint, "cpu", None, False)
+
+    assert {parameter.dtype for parameter in model.parameters()} == {torch.float32}
+    result = model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False, **DECODE_OPTIONS)
+    assert "segments" in result
+
+
+def test_transcribe_in_worker_process(fp16_checkpoint, audio_file):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=initialize_worker, initargs=(fp16_checkpoint, None, False)) as executor:
+        result = executor.submit(transcribe_in_worker, audio_file, DECODE_OPTIONS, "transcribe").result(timeout=300)
+
+    assert result["language"] == "en"
+    assert "segments" in result
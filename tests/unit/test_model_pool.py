@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.model_pool.AsyncModelPool import AsyncModelPool
+
+
+def build_pool(monkeypatch, engine: str, use_process_pool_on_cpu: bool) -> AsyncModelPool:
+    # 模型池是单例，每个测试重新创建 | The model pool is a singleton, create a fresh one per test
+    monkeypatch.setattr(AsyncModelPool, "_instance", None)
+    pool = AsyncModelPool(
+        engine=engine,
+        openai_whisper_model_name="tiny",
+        openai_whisper_device="cpu",
+        openai_whisper_download_root=None,
+        openai_whisper_in_memory=False,
+        faster_whisper_model_size_or_path="tiny",
+        faster_whisper_device="cpu",
+        faster_whisper_device_index=0,
+        faster_whisper_compute_type="int8",
+        faster_whisper_cpu_threads=0,
+        faster_whisper_num_workers=1,
+        faster_whisper_download_root=None,
+        use_process_pool_on_cpu=use_process_pool_on_cpu
+    )
+    created = []
+
+    async def create_and_put_model(instance_index):
+        created.append(instance_index)
+        pool.current_size += 1
+
+    monkeypatch.setattr(pool, "_create_and_put_model", create_and_put_model)
+    pool.created = created
+    return pool
+
+
+def test_process_pool_skips_in_process_models(monkeypatch):
+    pool = build_pool(monkeypatch, "openai_whisper", use_process_pool_on_cpu=True)
+    asyncio.run(pool.initialize_pool())
+
+    assert pool.should_use_process_pool()
+    assert pool.created == []
+    # 最大池大小仍用于计算并发任务数 | The max pool size still drives the task concurrency
+    assert pool.pool.maxsize == pool.max_size
+
+
+@pytest.mark.parametrize("engine, use_process_pool_on_cpu", [
+    ("openai_whisper", False),
+    ("faster_whisper", True)
+])
+def test_thread_pool_loads_in_process_models(monkeypatch, engine, use_process_pool_on_cpu):
+    pool = build_pool(monkeypatch, engine, use_process_pool_on_cpu)
+    asyncio.run(pool.initialize_pool())
+
+    assert not pool.should_use_process_pool()
+    assert pool.created == list(range(pool.max_size))
@@ -0,0 +1,147 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.database.DatabaseManager import DatabaseManager
+from app.database.models.TaskModels import Task, TaskStatus
+from app.services.whisper_service import WhisperService
+from app.utils.result_utils import save_result_file, load_result_file
+from config.settings import Settings
+
+CONTENT_HASH = "a" * 64
+RESULT = {"text": "hello", "segments": [{"id": 0, "start": 0.0, "end": 1.0, "text": "hello"}], "info": {}}
+
+
+class FakeFileUtils:
+    def __init__(self):
+        self.deleted = []
+
+    async def save_uploaded_file_with_hash(self, file, file_name):
+        return f"/tmp/{file_name}", CONTENT_HASH, 1024
+
+    async def get_audio_duration(self, file_path):
+        return 10.0
+
+    async def delete_file(self, file_path):
+        self.deleted.append(file_path)
+
+
+class FakeTaskProcessor:
+    def __init__(self):
+        self.notified = 0
+        self.callbacks = []
+
+    def notify_new_task(self):
+        self.notified += 1
+
+    def enqueue_callback(self, task):
+        self.callbacks.append(task.id)
+
+
+def build_service(db_manager: DatabaseManager) -> WhisperService:
+    service = WhisperService.__new__(WhisperService)
+    service.logger = SimpleNamespace(info=lambda *args: None, debug=lambda *args: None)
+    service.model_pool = SimpleNamespace(engine="openai_whisper")
+    service.db_manager = db_manager
+    service.file_utils = FakeFileUtils()
+    service.task_processor = FakeTaskProcessor()
+    return service
+
+
+async def create_task(service: WhisperService, callback_url=None) -> Task:
+    return await service.create_whisper_task(
+        file_upload=object(),
+        file_name="audio.wav",
+        file_url=None,
+        callback_url=callback_url,
+        platform=None,
+        decode_options={"language": None},
+        task_type="transcribe",
+        priority="normal",
+        request=SimpleNamespace(url_for=lambda name: "http://testserver/api/whisper/tasks/result")
+    )
+
+
+async def add_completed_task(db_manager: DatabaseManager, result_dir: str) -> Task:
+    task = Task(engine_name="openai_whisper", task_type="transcribe", file_name="audio.wav",
+                decode_options={"language": None}, content_hash=CONTENT_HASH, priority="normal",
+                status=TaskStatus.completed, language="en")
+    await db_manager.add_task(task)
+    task.result_path = save_result_file(task.id, RESULT, result_dir=result_dir)
+    await db_manager.update_task(task.id, result_path=task.result_path)
+    return task
+
+
+@pytest.fixture
+def result_cache(monkeypatch):
+    monkeypatch.setattr(Settings.WhisperServiceSettings, "ENABLE_RESULT_CACHE", True)
+    monkeypatch.setattr(Settings.FileSettings, "delete_temp_files_after_processing", True)
+
+
+def test_cache_hit_creates_completed_task_sharing_result(tmp_path, run_with_db, result_cache):
+    async def scenario(db_manager):
+        service = build_service(db_manager)
+        cached_task = await add_completed_task(db_manager, str(tmp_path))
+
+        task = await create_task(service, callback_url="http://example.com/callback")
+
+        assert task.id != cached_task.id
+        assert task.status == TaskStatus.completed
+        assert task.result_path == cached_task.result_path
+        assert task.language == "en"
+        assert task.task_processing_time == 0
+        assert service.file_utils.deleted == ["/tmp/audio.wav"]
+        assert service.task_processor.callbacks == [task.id]
+        assert service.task_processor.notified == 0
+        assert (await db_manager.get_task(task.id)).result == RESULT
+
+    run_with_db(scenario)
+
+
+def test_duplicate_in_flight_submission_creates_new_task_by_default(run_with_db, result_cache):
+    async def scenario(db_manager):
+        service = build_service(db_manager)
+        first = await create_task(service)
+        second = await create_task(service)
+
+        assert first.status == TaskStatus.queued
+        assert second.status == TaskStatus.queued
+        assert second.id != first.id
+        assert service.task_processor.notified == 2
+
+    run_with_db(scenario)
+
+
+def test_duplicate_in_flight_submission_returns_original_task_when_enabled(run_with_db, result_cache, monkeypatch):
+    monkeypatch.setattr(Settings.WhisperServiceSettings, "DEDUPLICATE_IN_FLIGHT_TASKS", True)
+
+    async def scenario(db_manager):
+        service = build_service(db_manager)
+        first = await create_task(service)
+        second = await create_task(service)
+        other_callback = await create_task(service, callback_url="http://example.com/callback")
+
+        assert second.id == first.id
+        assert other_callback.id != first.id
+        assert service.task_processor.notified == 2
+
+    run_with_db(scenario)
+
+
+def test_deleting_one_task_keeps_shared_result_file(tmp_path, run_with_db, result_cache):
+    async def scenario(db_manager):
+        service = build_service(db_manager)
+        cached_task = await add_completed_task(db_manager, str(tmp_path))
+        task = await create_task(service)
+        result_path = cached_task.result_path
+
+        assert await db_manager.delete_task(cached_task.id)
+        assert os.path.exists(result_path)
+        assert (await db_manager.get_task(task.id)).result == RESULT
+
+        assert await db_manager.delete_task(task.id)
+        assert not os.path.exists(result_path)
+        assert load_result_file(result_path) is None
+
+    run_with_db(scenario)
@@ -0,0 +1,350 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.database.models.TaskModels import Task, TaskStatus
+from app.processors.task_processor import TaskProcessor
+from config.settings import Settings
+
+
+def build_processor(max_concurrent_tasks: int) -> TaskProcessor:
+    model_pool = SimpleNamespace(engine="faster_whisper", should_use_process_pool=lambda: False)
+    processor = TaskProcessor(
+        model_pool=model_pool,
+        file_utils=None,
+        database_type="sqlite",
+        database_url="sqlite+aiosqlite:///:memory:",
+        max_concurrent_tasks=max_concurrent_tasks,
+        task_status_check_interval=1
+    )
+    processor._executor.shutdown(wait=False)
+    processor._prefetch_executor.shutdown(wait=False)
+    return processor
+
+
+@pytest.fixture
+def reserved_slots(monkeypatch):
+    monkeypatch.setattr(Settings.WhisperServiceSettings, "SHORT_TASK_RESERVED_SLOTS", 2)
+
+
+def test_single_slot_reserves_nothing_for_short_tasks(reserved_slots):
+    processor = build_processor(1)
+    assert processor.max_concurrent_tasks == 1
+    assert processor.short_task_reserved_slots == 0
+
+
+def test_reserved_slots_leave_one_slot_for_long_tasks(reserved_slots):
+    assert build_processor(2).short_task_reserved_slots == 1
+    assert build_processor(4).short_task_reserved_slots == 2
+
+
+class FakeTokenizer:
+    timestamp_begin = 1000
+
+    @staticmethod
+    def decode(tokens):
+        return " ".join(str(token) for token in tokens)
+
+
+def decoding_result(tokens):
+    return SimpleNamespace(tokens=tokens, avg_logprob=-0.1, compression_ratio=1.2, no_speech_prob=0.01)
+
+
+def test_split_timestamped_tokens_pairs_timestamps():
+    # <|0.00|> 1 2 <|1.00|> <|1.00|> 3 <|2.50|>
+    result = decoding_result([1000, 1, 2, 1050, 1050, 3, 1125])
+    segments = TaskProcessor._split_timestamped_tokens(FakeTokenizer(), result, 0.0, 5.0)
+    assert [(seg["id"], seg["start"], seg["end"], seg["tokens"]) for seg in segments] == [
+        (0, 0.0, 1.0, [1, 2]),
+        (1, 1.0, 2.5, [3])
+    ]
+    assert segments[0]["text"] == "1 2"
+    assert segments[1]["avg_logprob"] == -0.1
+
+
+def test_split_timestamped_tokens_unpaired_trailing_timestamp():
+    # <|0.00|> 1 <|1.00|> <|1.00|> 2 3（缺少结束时间戳 | missing closing timestamp）
+    result = decoding_result([1000, 1, 1050, 1050, 2, 3])
+    segments = TaskProcessor._split_timestamped_tokens(FakeTokenizer(), result, 0.2, 4.0)
+    assert [(seg["start"], seg["end"], seg["tokens"]) for seg in segments] == [
+        (0.0, 1.0, [1]),
+        (1.0, 4.0, [2, 3])
+    ]
+    assert segments[1]["temperature"] == 0.2
+
+
+def test_split_timestamped_tokens_text_only():
+    segments = TaskProcessor._split_timestamped_tokens(FakeTokenizer(), decoding_result([1, 2, 3]), 0.0, 3.5)
+    assert len(segments) == 1
+    assert (segments[0]["start"], segments[0]["end"], segments[0]["tokens"]) == (0.0, 3.5, [1, 2, 3])
+
+
+def test_split_timestamped_tokens_empty():
+    assert TaskProcessor._split_timestamped_tokens(FakeTokenizer(), decoding_result([1000, 1050]), 0.0, 1.0) == []
+
+
+@pytest.fixture
+def batch_processor(monkeypatch):
+    processor = build_processor(2)
+    calls = {"completed": [], "fallback": []}
+
+    @contextmanager
+    def lease_model():
+        yield object()
+
+    def complete_task(task, segments, language, info, task_processing_time):
+        calls["completed"].append(task.id)
+        return {"id": task.id, "segments": segments, "language": language}
+
+    def process_task_sync(task):
+        calls["fallback"].append(task.id)
+        return {"id": task.id, "fallback": True}
+
+    monkeypatch.setattr(processor, "_lease_model", lease_model)
+    monkeypatch.setattr(processor, "_complete_task", complete_task)
+    monkeypatch.setattr(processor, "_process_task_sync", process_task_sync)
+    return processor, calls
+
+
+def test_process_batch_maps_results_to_tasks(batch_processor, monkeypatch):
+    processor, calls = batch_processor
+    tasks = [SimpleNamespace(id=task_id) for task_id in (1, 2, 3)]
+    transcribe_results = [
+        {"segments": [{"text": "a"}], "language": "en"},
+        None,
+        {"segments": [{"text": "c"}], "language": "zh"}
+    ]
+    monkeypatch.setattr(processor, "_transcribe_short_batch", lambda model, batch: transcribe_results)
+
+    results = processor._process_batch_sync(tasks)
+
+    assert results == [
+        {"id": 1, "segments": [{"text": "a"}], "language": "en"},
+        {"id": 2, "fallback": True},
+        {"id": 3, "segments": [{"text": "c"}], "language": "zh"}
+    ]
+    assert calls == {"completed": [1, 3], "fallback": [2]}
+
+
+def test_process_batch_falls_back_for_all_tasks_on_error(batch_processor, monkeypatch):
+    processor, calls = batch_processor
+    tasks = [SimpleNamespace(id=task_id) for task_id in (1, 2)]
+
+    def transcribe_short_batch(model, batch):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(processor, "_transcribe_short_batch", transcribe_short_batch)
+
+    results = processor._process_batch_sync(tasks)
+
+    assert results == [{"id": 1, "fallback": True}, {"id": 2, "fallback": True}]
+    assert calls == {"completed": [], "fallback": [1, 2]}
+
+
+def queue_task(file_duration, duration_bin, priority="normal") -> Task:
+    return Task(engine_name="faster_whisper", task_type="transcribe", file_name="audio.wav",
+                file_duration=file_duration, duration_bin=duration_bin, priority=priority)
+
+
+def test_claim_short_tasks_only(run_with_db):
+    async def scenario(db_manager):
+        long_task = queue_task(600, 2, priority="high")
+        short_tasks = [queue_task(20, 0), queue_task(45, 0)]
+        for task in [long_task, *short_tasks]:
+            await db_manager.add_task(task)
+
+        claimed = await db_manager.claim_queued_tasks(5, max_duration=60)
+
+        assert [task.id for task in claimed] == [task.id for task in short_tasks]
+        assert (await db_manager.get_task(long_task.id)).status == TaskStatus.queued
+        for task in short_tasks:
+            assert (await db_manager.get_task(task.id)).status == TaskStatus.processing
+
+    run_with_db(scenario)
+
+
+def test_claim_rotates_over_busy_bins(run_with_db, monkeypatch):
+    async def scenario(db_manager):
+        processor = build_processor(4)
+        processor.db_manager = db_manager
+        processor.duration_bin_edges = [60, 300, 1800]
+        # 每个分桶都有排队任务，短任务优先级最高 | Every bin has queued tasks, short tasks have the highest priority
+        for file_duration, duration_bin, priority in [(10, 0, "high"), (20, 0, "high"), (120, 1, "normal"),
+                                                       (900, 2, "low"), (3600, 3, "low"), (None, None, "low"),
+                                                       (None, None, "low")]:
+            await db_manager.add_task(queue_task(file_duration, duration_bin, priority))
+
+        claimed_bins = []
+        for _ in range(6):
+            tasks = await processor._claim_tasks(4, None)
+            claimed_bins.append([task.duration_bin for task in tasks])
+
+        # 长任务在轮转中得到认领，时长未知的任务每次只认领一个 | Long tasks get their turn, unknown durations are claimed one at a time
+        assert claimed_bins == [[0, 0], [1], [2], [3], [None], [None]]
+        assert await processor._claim_tasks(4, None) == []
+
+    run_with_db(scenario)
+
+
+def test_reserved_slots_claim_short_tasks_only(run_with_db):
+    async def scenario(db_manager):
+        processor = build_processor(4)
+        processor.db_manager = db_manager
+        processor.duration_bin_edges = [60, 300, 1800]
+        for file_duration, duration_bin in [(900, 2), (None, None), (120, 1), (30, 0)]:
+            await db_manager.add_task(queue_task(file_duration, duration_bin))
+
+        tasks = await processor._claim_tasks(4, processor.short_task_max_duration)
+
+        assert [task.file_duration for task in tasks] == [30]
+        assert await processor._claim_tasks(4, processor.short_task_max_duration) == []
+
+    run_with_db(scenario)
+
+
+def test_busy_long_slots_request_short_tasks(reserved_slots):
+    async def scenario():
+        processor = build_processor(3)
+        processor.loop = asyncio.get_running_loop()
+        long_task = processor.loop.create_future()
+        # 两个长任务占满了非保留槽位 | Two long tasks fill the non-reserved slots
+        processor._in_flight_tasks = {long_task: (2, 2)}
+        worker = asyncio.create_task(processor.process_tasks_worker())
+        try:
+            limit, max_duration = await asyncio.wait_for(processor.fetch_queue.get(), 1)
+            assert (limit, max_duration) == (1, processor.short_task_max_duration)
+
+            # 长任务完成后释放的槽位可以认领任意时长的任务 | Once the long tasks finish, the freed slots may claim tasks of any duration
+            long_task.set_result(None)
+            processor._in_flight_tasks = {}
+            await processor.task_processing_queue.put([])
+            limit, max_duration = await asyncio.wait_for(processor.fetch_queue.get(), 1)
+            assert (limit, max_duration) == (1, None)
+        finally:
+            processor.shutdown_event.set()
+            await processor.task_processing_queue.put([])
+            await asyncio.wait_for(worker, 2)
+
+    asyncio.run(scenario())
+
+
+def test_collect_segments_waits_for_segment_writes():
+    processor = build_processor(2)
+    processor.segment_flush_size = 2
+    processor.loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=processor.loop.run_forever)
+    thread.start()
+    written = []
+
+    async def delete_task_segments(task_id):
+        written.append((task_id, "deleted"))
+
+    async def add_task_segments(task_id, segments):
+        await asyncio.sleep(0.05)
+        if segments[0]["id"] == 2:
+            raise RuntimeError("database is locked")
+        written.append((task_id, [segment["id"] for segment in segments]))
+
+    processor.db_manager = SimpleNamespace(add_task_segments=add_task_segments,
+                                           delete_task_segments=delete_task_segments)
+    try:
+        segments = processor._collect_segments(7, [{"id": index, "text": str(index)} for index in range(5)])
+    finally:
+        processor.loop.call_soon_threadsafe(processor.loop.stop)
+        thread.join()
+        processor.loop.close()
+
+    assert [segment["id"] for segment in segments] == [0, 1, 2, 3, 4]
+    # 返回前所有写入均已结束，失败的写入不会中断转录 | All writes have finished before returning, a failed write does not abort transcription
+    # 上一次处理保存的片段先被清除 | Segments saved by a previous run are cleared first
+    assert written == [(7, "deleted"), (7, [0, 1]), (7, [4])]
+
+
+def test_segments_are_replaced_on_reprocessing_and_deleted_on_completion(run_with_db):
+    async def scenario(db_manager):
+        task = queue_task(10, 0)
+        await db_manager.add_task(task)
+        segments = [{"id": index, "start": float(index), "end": index + 1.0, "text": str(index)} for index in range(3)]
+
+        for _ in range(2):
+            await db_manager.delete_task_segments(task.id)
+            await db_manager.add_task_segments(task.id, segments)
+        assert [segment["id"] for segment in await db_manager.get_task_segments(task.id)] == [0, 1, 2]
+
+        await db_manager.bulk_update_tasks_by_id([{"id": task.id, "status": TaskStatus.completed}])
+        assert await db_manager.get_task_segments(task.id) == []
+
+
+class FakeBatchedInferencePipeline:
+    instances = []
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+        FakeBatchedInferencePipeline.instances.append(self)
+
+    def transcribe(self, audio, clip_timestamps=None, **kwargs):
+        # 与 faster_whisper 一致地遍历片段字典 | Iterate the segment dictionaries the same way faster_whisper does
+        clips = [{key: int(value * 16000) for key, value in segment.items()} for segment in clip_timestamps or []]
+        self.calls.append((clip_timestamps, clips, kwargs))
+        return [], SimpleNamespace(language="en")
+
+
+def router_decode_options(clip_timestamps: str) -> dict:
+    # 与 whisper_tasks 路由构造的解码选项结构一致 | Same structure as the decode options built by the whisper_tasks router
+    return {
+        "language": None,
+        "temperature": [0.0, 0.2],
+        "compression_ratio_threshold": 2.4,
+        "no_speech_threshold": 0.6,
+        "condition_on_previous_text": True,
+        "initial_prompt": "",
+        "word_timestamps": False,
+        "prepend_punctuations": "\"'“¿([{-",
+        "append_punctuations": "\"'.。,，!！?？:：”)]}、",
+        "clip_timestamps": [float(clip) for clip in clip_timestamps.split(",")] if "," in clip_timestamps else clip_timestamps,
+        "hallucination_silence_threshold": None
+    }
+
+
+def test_batched_pipeline_receives_clip_dictionaries(monkeypatch):
+    processor = build_processor(2)
+    processor.batch_size = 8
+    model = type("FakeWhisperModel", (), {})()
+    completed = []
+
+    @contextmanager
+    def lease_model():
+        yield model
+
+    monkeypatch.setattr("app.processors.task_processor.BatchedInferencePipeline", FakeBatchedInferencePipeline)
+    monkeypatch.setattr(FakeBatchedInferencePipeline, "instances", [])
+    monkeypatch.setattr(processor, "_lease_model", lease_model)
+    monkeypatch.setattr(processor, "_collect_segments", lambda task_id, segments: list(segments))
+    monkeypatch.setattr(processor, "_complete_task", lambda task, *args: completed.append(task.id))
+
+    for task_id, clip_timestamps in enumerate(["0", "1.5,3,10"], start=1):
+        task = Task(id=task_id, engine_name="faster_whisper", task_type="transcribe", file_path="/tmp/audio.wav",
+                    file_duration=42.0, decode_options=router_decode_options(clip_timestamps))
+        processor._process_task_sync(task)
+
+    assert completed == [1, 2]
+    # 同一个模型实例只构建一次批量推理管线 | The batched pipeline is built once per model instance
+    assert len(FakeBatchedInferencePipeline.instances) == 1
+    calls = FakeBatchedInferencePipeline.instances[0].calls
+    assert calls[0][0] is None
+    assert calls[1][0] == [{"start": 1.5, "end": 3.0}, {"start": 10.0, "end": 42.0}]
+    assert calls[1][2]["batch_size"] == 8
+    assert calls[1][2]["temperature"] == [0.0, 0.2]
+
+
+def test_batched_clip_timestamps():
+    assert TaskProcessor._batched_clip_timestamps(None, 10.0) is None
+    assert TaskProcessor._batched_clip_timestamps("0", 10.0) is None
+    assert TaskProcessor._batched_clip_timestamps([0.0], 10.0) is None
+    assert TaskProcessor._batched_clip_timestamps("5", 10.0) == [{"start": 5.0, "end": 10.0}]
+    assert TaskProcessor._batched_clip_timestamps("5", None) == [{"start": 5.0, "end": 35.0}]
+    assert TaskProcessor._batched_clip_timestamps([1.0, 2.0], None) == [{"start": 1.0, "end": 2.0}]